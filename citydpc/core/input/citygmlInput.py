@@ -1,4 +1,5 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,6 +9,8 @@ if TYPE_CHECKING:
 
 import lxml.etree as ET
 import numpy as np
+import functools
+import re
 import matplotlib.path as mplP
 
 from citydpc.logger import logger
@@ -21,6 +24,45 @@ from citydpc.core.object.geometry import GeometryGML
 from citydpc.tools.partywall import get_party_walls
 from . import CALC_ROOF_VOLUME_ON_IMPORT
 
+# number of buildings send to a worker process at once when parsing in parallel
+_PARALLEL_CHUNK_SIZE = 64
+
+# elements reported while streaming a file, the gml namespaces are spelled out
+# to not be notified about every bldg:boundedBy of every building
+_STREAMED_TAGS = (
+    "{http://www.opengis.net/gml}boundedBy",
+    "{http://www.opengis.net/gml/3.2}boundedBy",
+    "{http://www.opengis.net/gml}name",
+    "{http://www.opengis.net/gml/3.2}name",
+    "{*}cityObjectMember",
+)
+
+# gml:id attribute of buildings, building parts and addresses
+_GML_ID = "{http://www.opengis.net/gml}id"
+
+# lod geometry elements of a building that decide how its surfaces are loaded
+_LOD_GEOMETRY_PATHS_2_0 = (
+    "bldg:lod0FootPrint | bldg:lod0RoofEdge | bldg:lod1Solid | bldg:lod2Solid"
+)
+_LOD_GEOMETRY_PATHS_3_0 = "lod0MultiSurface | lod1Solid | lod2Solid"
+
+# building attributes stored in direct children of a building element
+# (prefixed tag, attribute name, type of the value)
+_BUILDING_ATTRIBUTES = (
+    ("bldg:usage", "usage", str),
+    ("bldg:function", "function", str),
+    ("bldg:roofType", "roofType", str),
+    ("bldg:storeysAboveGround", "storeysAboveGround", int),
+    ("bldg:storeyHeightsAboveGround", "storeyHeightsAboveGround", float),
+    ("bldg:storeysBelowGround", "storeysBelowGround", int),
+    ("bldg:storeyHeightsBelowGround", "storeyHeightsBelowGround", float),
+)
+_BUILDING_ATTRIBUTES_2_0 = (
+    ("core:creationDate", "creationDate", str),
+    ("bldg:yearOfConstruction", "yearOfConstruction", int),
+    ("bldg:measuredHeight", "measuredHeight", float),
+)
+
 
 def load_buildings_from_xml_file(
     dataset: Dataset,
@@ -30,6 +72,7 @@ def load_buildings_from_xml_file(
     ignoreRefSystem: bool = False,
     ignoreExistingTransform: bool = False,
     updatePartyWalls: bool = False,
+    numWorkers: int = 1,
 ):
     """adds buildings from filepath to the dataset
 
@@ -50,19 +93,225 @@ def load_buildings_from_xml_file(
         by default False
     updatePartyWalls : bool, optional
         flag to update party walls, by default False
+    numWorkers : int, optional
+        number of processes used to parse the buildings, None uses
+        os.cpu_count(), by default 1 (parsing in the calling process)
     """
     logger.info(f"loading buildings from CityGML file {filepath}")
+    # stream the file and only materialize one cityObjectMember at a time
+    context = ET.iterparse(
+        filepath,
+        events=("end",),
+        tag=_STREAMED_TAGS,
+        remove_blank_text=True,
+    )
+
+    root = None
+    nsmap = None
+    cityGMLversion = None
+    ades = []
+    envelope_E = None
+    gmlName = None
+    headerChecked = False
+    fileSRSName = None
+    lowerCorner = None
+    upperCorner = None
+    border = None
+
+    building_ids = []
+    num_cityObjectMembers = 0
+
+    executor = None
+    futures = []
+    chunk = []
+
+    try:
+        for _, element_E in context:
+            if root is None:
+                root = element_E.getroottree().getroot()
+                nsmap, cityGMLversion, ades = _get_namespace_info_of_root(root)
+
+                boundedByTag = f"{{{nsmap['gml']}}}boundedBy"
+                gmlNameTag = f"{{{nsmap['gml']}}}name"
+                cityObjectMemberTag = f"{{{nsmap['core']}}}cityObjectMember"
+
+            # only direct children of the CityModel are of interest here
+            if element_E.getparent() is not root:
+                continue
+
+            if element_E.tag == boundedByTag:
+                envelope_E = _find_xml_element(element_E, nsmap, "gml:Envelope")
+                continue
+            elif element_E.tag == gmlNameTag:
+                gmlName = element_E.text
+                continue
+            elif element_E.tag != cityObjectMemberTag:
+                continue
+
+            if not headerChecked:
+                headerChecked = True
+                res = _check_xml_file_header(
+                    dataset,
+                    envelope_E,
+                    nsmap,
+                    borderCoordinates,
+                    ignoreRefSystem,
+                    ignoreExistingTransform,
+                )
+                if res is None:
+                    return
+                fileSRSName, lowerCorner, upperCorner, border = res
+                if numWorkers is None or numWorkers > 1:
+                    executor = ProcessPoolExecutor(max_workers=numWorkers)
+
+            num_cityObjectMembers += 1
+            buildings_in_com = _findall_xml_elements(element_E, nsmap, "bldg:Building")
+
+            for building_E in buildings_in_com:
+                building_id = building_E.attrib[_GML_ID]
+                if building_id in dataset.buildings:
+                    logger.warning(
+                        f"Doubling of building id {building_id} "
+                        + "Only first mention will be considered"
+                    )
+                    continue
+
+                if executor is not None:
+                    # parsing is done by the worker processes, only the serialized
+                    # subtree is kept here, doublings are checked when merging
+                    chunk.append(ET.tostring(building_E))
+                    if len(chunk) >= _PARALLEL_CHUNK_SIZE:
+                        futures.append(
+                            executor.submit(
+                                _load_buildings_from_xml_strings,
+                                chunk,
+                                nsmap,
+                                cityGMLversion,
+                            )
+                        )
+                        chunk = []
+                    continue
+
+                new_building = _load_building_from_xml_element(
+                    building_E, nsmap, cityGMLversion
+                )
+
+                if not check_building_for_border_and_address(
+                    new_building, borderCoordinates, addressRestriciton, border
+                ):
+                    continue
+
+                dataset.buildings[building_id] = new_building
+                building_ids.append(building_id)
+
+            if not buildings_in_com:
+                dataset.otherCityObjectMembers.append(element_E)
+            else:
+                # free the already processed part of the tree
+                element_E.clear(keep_tail=True)
+            while element_E.getprevious() is not None:
+                del root[0]
+
+        if executor is not None:
+            if chunk:
+                futures.append(
+                    executor.submit(
+                        _load_buildings_from_xml_strings, chunk, nsmap, cityGMLversion
+                    )
+                )
+            # collect in submission order to keep the order of the file
+            for future in futures:
+                for new_building in future.result():
+                    # same as the serial path, a rejected building does not
+                    # block a later mention of its id
+                    if new_building.gml_id in dataset.buildings:
+                        logger.warning(
+                            f"Doubling of building id {new_building.gml_id} "
+                            + "Only first mention will be considered"
+                        )
+                        continue
+                    # pickling drops the views into the packed coordinates
+                    new_building.pack_surface_coordinates()
+                    for buildingPart in new_building.building_parts:
+                        buildingPart.pack_surface_coordinates()
+                    if not check_building_for_border_and_address(
+                        new_building, borderCoordinates, addressRestriciton, border
+                    ):
+                        continue
+                    dataset.buildings[new_building.gml_id] = new_building
+                    building_ids.append(new_building.gml_id)
+    finally:
+        # also stop the worker processes if loading fails, pending futures are
+        # cancelled by hand as shutdown(cancel_futures=True) needs Python 3.9
+        if executor is not None:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    if not headerChecked:
+        if root is None:
+            # no streamed element at all, the CityModel still has to be valid
+            nsmap, cityGMLversion, ades = _get_namespace_info_of_root(context.root)
+        res = _check_xml_file_header(
+            dataset,
+            envelope_E,
+            nsmap,
+            borderCoordinates,
+            ignoreRefSystem,
+            ignoreExistingTransform,
+        )
+        if res is None:
+            return
+        fileSRSName, lowerCorner, upperCorner, border = res
+
+    notLoadedCityObjectMembers = num_cityObjectMembers - len(building_ids)
+
+    # store file related information
+    newCFile = CityFile(
+        filepath,
+        f"CityGMLv{cityGMLversion}",
+        building_ids,
+        notLoadedCityObjectMembers,
+        ades,
+        srsName=fileSRSName,
+        gmlName=gmlName,
+    )
+    if lowerCorner:
+        newCFile.lowerCorner = (float(lowerCorner[0]), float(lowerCorner[1]))
+    if upperCorner:
+        newCFile.upperCorner = (float(upperCorner[0]), float(upperCorner[1]))
+    dataset._files.append(newCFile)
+    if not dataset.transform:
+        dataset.transform = {"scale": [1, 1, 1], "translate": [0, 0, 0]}
+    if updatePartyWalls:
+        dataset.party_walls = get_party_walls(dataset)
+    logger.info(f"finished loading buildings from CityGML file {filepath}")
+
+
+def _get_namespace_info_of_root(root: ET.Element) -> tuple[dict, str, list[str]]:
+    """gets the namespace map, CityGML version and ADEs of a CityGML file
+
+    Parameters
+    ----------
+    root : ET.Element
+        <core:CityModel> root lxml.etree element of the file
+
+    Returns
+    -------
+    tuple[dict, str, list[str]]
+        namespace map, CityGML version and list of ADEs used in the file
+
+    Raises
+    ------
+    ValueError
+        if the CityGML version of the file is not supported
+    """
     supportedCityGMLversions = ["1.0", "2.0", "3.0"]
-    parser = ET.XMLParser(remove_blank_text=True)
-    tree = ET.parse(filepath, parser)
-    root = tree.getroot()
-    nsmap = root.nsmap
+    nsmap = dict(root.nsmap)
 
     if "core" not in nsmap.keys() and None in nsmap.keys():
         nsmap["core"] = nsmap[None]
 
-    building_ids = []
-
     # get CityGML version
     cityGMLversion = nsmap["core"].rsplit("/", 1)[-1]
     if cityGMLversion not in supportedCityGMLversions:
@@ -74,15 +323,120 @@ def load_buildings_from_xml_file(
         if nsmap["energy"] == "http://www.sig3d.org/citygml/2.0/energy/1.0":
             ades.append("energyADE")
 
+    return nsmap, cityGMLversion, ades
+
+
+def _load_building_from_xml_element(
+    building_E: ET.Element, nsmap: dict, cityGMLversion: str
+) -> Building:
+    """creates a building (including its building parts) from xml element
+
+    Parameters
+    ----------
+    building_E : ET.Element
+        <bldg:Building> lxml.etree element
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    cityGMLversion : str
+        version of the CityGML file
+
+    Returns
+    -------
+    Building
+        newly created building
+    """
+    building_id = building_E.attrib[_GML_ID]
+    new_building = Building(building_id)
+    _load_building_information_from_xml(building_E, nsmap, new_building, cityGMLversion)
+
+    bps_in_bldg = _findall_xml_elements(
+        building_E, nsmap, "bldg:consistsOfBuildingPart/bldg:BuildingPart"
+    )
+    for bp_E in bps_in_bldg:
+        bp_id = bp_E.attrib[_GML_ID]
+        new_building_part = BuildingPart(bp_id, building_id)
+        _load_building_information_from_xml(
+            bp_E, nsmap, new_building_part, cityGMLversion
+        )
+        new_building.add_building_part(new_building_part)
+
+    return new_building
+
+
+def _load_buildings_from_xml_strings(
+    buildingStrings: list[bytes], nsmap: dict, cityGMLversion: str
+) -> list[Building]:
+    """creates buildings from serialized <bldg:Building> elements, used as
+    worker function for parallel parsing
+
+    Parameters
+    ----------
+    buildingStrings : list[bytes]
+        serialized <bldg:Building> elements
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    cityGMLversion : str
+        version of the CityGML file
+
+    Returns
+    -------
+    list[Building]
+        newly created buildings in the order of buildingStrings
+    """
+    return [
+        _load_building_from_xml_element(
+            ET.fromstring(buildingString), nsmap, cityGMLversion
+        )
+        for buildingString in buildingStrings
+    ]
+
+
+def _check_xml_file_header(
+    dataset: Dataset,
+    envelope_E: ET.Element | None,
+    nsmap: dict,
+    borderCoordinates: list | None,
+    ignoreRefSystem: bool,
+    ignoreExistingTransform: bool,
+) -> tuple | None:
+    """checks the gml:Envelope of a file for compatability with the dataset and
+    creates the border for coordinate restriction
+
+    Parameters
+    ----------
+    dataset : Dataset
+        dataset the file should be added to
+    envelope_E : ET.Element | None
+        <gml:Envelope> lxml.etree element of the file, None if not present
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    borderCoordinates : list | None
+        list of coordinates ([x0, y0], [x1, y1], ..) in fileCRS to restrict the
+        dataset
+    ignoreRefSystem : bool
+        flag to ignore comparission between reference system name in new file and
+        dataset
+    ignoreExistingTransform : bool
+        flag to ignore comparission between transform object in new file and dataset
+
+    Returns
+    -------
+    tuple | None
+        (srsName, lowerCorner, upperCorner, border) of the file or None if the
+        file should not be loaded
+    """
     # find gml envelope and check for compatability
     fileSRSName = None
     lowerCorner = None
     upperCorner = None
-    envelope_E = root.find("gml:boundedBy/gml:Envelope", nsmap)
     if envelope_E is not None:
         fileSRSName = envelope_E.attrib["srsName"]
-        lowerCorner = envelope_E.find("gml:lowerCorner", nsmap).text.split(" ")
-        upperCorner = envelope_E.find("gml:upperCorner", nsmap).text.split(" ")
+        lowerCorner = _find_xml_element(
+            envelope_E, nsmap, "gml:lowerCorner"
+        ).text.split(" ")
+        upperCorner = _find_xml_element(
+            envelope_E, nsmap, "gml:upperCorner"
+        ).text.split(" ")
         if dataset.srsName is None:
             dataset.srsName = fileSRSName
         elif dataset.srsName == fileSRSName:
@@ -97,7 +451,7 @@ def load_buildings_from_xml_file(
                 f"Unable to load file! Given srsName ({fileSRSName}) does not match "
                 + f"Dataset srsName ({dataset.srsName})"
             )
-        if dataset.transform != {} and dataset.transform != {
+        if dataset.transform and dataset.transform != {
             "scale": [1, 1, 1],
             "translate": [0, 0, 0],
         }:
@@ -112,7 +466,7 @@ def load_buildings_from_xml_file(
         logger.error(
             "Unable to load file! Can't find gml:Envelope for srsName defenition"
         )
-        return
+        return None
 
     # creating border for coordinate restriction
     if borderCoordinates is not None:
@@ -125,83 +479,16 @@ def load_buildings_from_xml_file(
             fileEnvelopeCoor = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
             if not _border_check(border, borderCoordinates, fileEnvelopeCoor):
                 # file envelope is outside of the border coordinates
-                return
+                return None
         elif len(borderCoordinates) < 3:
             logger.error(
                 f"Only given {len(borderCoordinates)} borderCoordinates, can't continue"
             )
-            return
+            return None
     else:
         border = None
 
-    # find all buildings within file
-    cityObjectMembers_in_file = root.findall("core:cityObjectMember", nsmap)
-    for cityObjectMember_E in cityObjectMembers_in_file:
-        buildings_in_com = cityObjectMember_E.findall("bldg:Building", nsmap)
-
-        for building_E in buildings_in_com:
-            building_id = building_E.attrib["{http://www.opengis.net/gml}id"]
-            new_building = Building(building_id)
-            _load_building_information_from_xml(
-                building_E, nsmap, new_building, cityGMLversion
-            )
-
-            bps_in_bldg = building_E.findall(
-                "bldg:consistsOfBuildingPart/bldg:BuildingPart", nsmap
-            )
-            for bp_E in bps_in_bldg:
-                bp_id = bp_E.attrib["{http://www.opengis.net/gml}id"]
-                new_building_part = BuildingPart(bp_id, building_id)
-                _load_building_information_from_xml(
-                    bp_E, nsmap, new_building_part, cityGMLversion
-                )
-                new_building.building_parts.append(new_building_part)
-
-            if building_id in dataset.buildings.keys():
-                logger.warning(
-                    f"Doubling of building id {building_id} "
-                    + "Only first mention will be considered"
-                )
-                continue
-
-            if not check_building_for_border_and_address(
-                new_building, borderCoordinates, addressRestriciton, border
-            ):
-                continue
-
-            dataset.buildings[building_id] = new_building
-            building_ids.append(building_id)
-        else:
-            dataset.otherCityObjectMembers.append(cityObjectMember_E)
-
-    # find gmlName
-    gmlName = None
-    gmlName_E = root.find("gml:name", nsmap)
-    if gmlName_E is not None:
-        gmlName = gmlName_E.text
-
-    notLoadedCityObjectMembers = len(cityObjectMembers_in_file) - len(building_ids)
-
-    # store file related information
-    newCFile = CityFile(
-        filepath,
-        f"CityGMLv{cityGMLversion}",
-        building_ids,
-        notLoadedCityObjectMembers,
-        ades,
-        srsName=fileSRSName,
-        gmlName=gmlName,
-    )
-    if lowerCorner:
-        newCFile.lowerCorner = (float(lowerCorner[0]), float(lowerCorner[1]))
-    if upperCorner:
-        newCFile.upperCorner = (float(upperCorner[0]), float(upperCorner[1]))
-    dataset._files.append(newCFile)
-    if dataset.transform == {}:
-        dataset.transform = {"scale": [1, 1, 1], "translate": [0, 0, 0]}
-    if updatePartyWalls:
-        dataset.party_walls = get_party_walls(dataset)
-    logger.info(f"finished loading buildings from CityGML file {filepath}")
+    return fileSRSName, lowerCorner, upperCorner, border
 
 
 def _load_address_info_from_xml(
@@ -226,34 +513,61 @@ def _load_address_info_from_xml(
         xal = "xAL"
     else:
         logger.error("Namespace xal/xAL issue")
+        return
 
-    if "{http://www.opengis.net/gml}id" in addressElement.attrib.keys():
-        address.gml_id = addressElement.attrib["{http://www.opengis.net/gml}id"]
-
-    address.countryName = _get_text_of_xml_element(
-        addressElement, nsmap, f".//{xal}:CountryName"
-    )
-    address.locality_type = _get_attrib_of_xml_element(
-        addressElement, nsmap, f".//{xal}:Locality", "Type"
-    )
-    address.localityName = _get_text_of_xml_element(
-        addressElement, nsmap, f".//{xal}:LocalityName"
-    )
-    address.thoroughfare_type = _get_attrib_of_xml_element(
-        addressElement, nsmap, f".//{xal}:Thoroughfare", "Type"
-    )
-    address.thoroughfareNumber = _get_text_of_xml_element(
-        addressElement, nsmap, f".//{xal}:ThoroughfareNumber"
-    )
-    address.thoroughfareName = _get_text_of_xml_element(
-        addressElement, nsmap, f".//{xal}:ThoroughfareName"
-    )
-    address.postalCodeNumber = _get_text_of_xml_element(
-        addressElement, nsmap, f".//{xal}:PostalCodeNumber"
-    )
+    address.gml_id = addressElement.get(_GML_ID)
+
+    # single pass over all descendants, only the first match of a tag is used
+    addressTags = _get_xal_address_tags(nsmap[xal])
+    found = set()
+    for element_E in addressElement.iter():
+        target = addressTags.get(element_E.tag)
+        if target is None or target in found:
+            continue
+        found.add(target)
+        attribute, xmlAttribute = target
+        if xmlAttribute is None:
+            setattr(address, attribute, element_E.text)
+        else:
+            setattr(address, attribute, element_E.get(xmlAttribute))
     building.addressCollection.add_address(address)
 
 
+# tag localname: (CoreAddress attribute, xml attribute or None for the text)
+_XAL_ADDRESS_TARGETS = {
+    "CountryName": ("countryName", None),
+    "Locality": ("locality_type", "Type"),
+    "LocalityName": ("localityName", None),
+    "Thoroughfare": ("thoroughfare_type", "Type"),
+    "ThoroughfareNumber": ("thoroughfareNumber", None),
+    "ThoroughfareName": ("thoroughfareName", None),
+    "PostalCodeNumber": ("postalCodeNumber", None),
+}
+_xalAddressTagCache = {}
+
+
+def _get_xal_address_tags(xalNamespace: str) -> dict[str, tuple]:
+    """returns the mapping of qualified xAL tags to address attributes
+
+    Parameters
+    ----------
+    xalNamespace : str
+        namespace URI of xAL used in the file
+
+    Returns
+    -------
+    dict[str, tuple]
+        dictionary with qualified tag names as keys and tuples of
+        (CoreAddress attribute, xml attribute or None) as values
+    """
+    if xalNamespace not in _xalAddressTagCache:
+        _xalAddressTagCache[xalNamespace] = {
+            f"{{{xalNamespace}}}{localName}": target
+            for localName, target in _XAL_ADDRESS_TARGETS.items()
+        }
+    return _xalAddressTagCache[xalNamespace]
+
+
 def _load_address_info_From_xml_3_0(
     building, addressElement: ET.Element, nsmap: dict
 ) -> None:
@@ -313,28 +627,35 @@ def _load_building_information_from_xml(
         building, buildingElement, nsmap, cityGMLversion
     )
 
+    # direct children are grouped once, optional elements are only looked up in
+    # there instead of searching the building element for each of them
+    childrenByTag = _group_child_elements_by_tag(buildingElement)
+
     _get_building_attributes_from_xml_element(
-        building, buildingElement, nsmap, cityGMLversion
+        building, childrenByTag, nsmap, cityGMLversion
     )
 
     if cityGMLversion in ["1.0", "2.0"]:
-        lodNTI_E = buildingElement.find("bldg:lod2TerrainIntersection", nsmap)
-        if lodNTI_E is None:
-            lodNTI_E = buildingElement.find("bldg:lod1TerrainIntersection", nsmap)
-        if lodNTI_E is not None:
+        lodNTI_Es = _get_child_elements(
+            childrenByTag, nsmap, "bldg:lod2TerrainIntersection"
+        ) or _get_child_elements(childrenByTag, nsmap, "bldg:lod1TerrainIntersection")
+        if lodNTI_Es:
             building.terrainIntersections = []
-            curveMember_Es = lodNTI_E.findall(".//gml:curveMember", nsmap)
+            curveMember_Es = _findall_xml_elements(
+                lodNTI_Es[0], nsmap, ".//gml:curveMember"
+            )
             for curve_E in curveMember_Es:
                 building.terrainIntersections.append(
                     _get_polygon_coordinates_from_element(curve_E, nsmap)
                 )
 
-        extRef_E = buildingElement.find("core:externalReference", nsmap)
-        if extRef_E is not None:
+        extRef_Es = _get_child_elements(childrenByTag, nsmap, "core:externalReference")
+        if extRef_Es:
+            extRef_E = extRef_Es[0]
             building.extRef_infromationsSystem = _get_text_of_xml_element(
                 extRef_E, nsmap, "core:informationSystem"
             )
-            extObj_E = extRef_E.find("core:externalObject", nsmap)
+            extObj_E = _find_xml_element(extRef_E, nsmap, "core:externalObject")
             if extObj_E is not None:
                 building.extRef_objName = _get_text_of_xml_element(
                     extObj_E, nsmap, "core:name"
@@ -343,77 +664,64 @@ def _load_building_information_from_xml(
     if CALC_ROOF_VOLUME_ON_IMPORT:
         building._calc_roof_volume()
     building.create_legacy_surface_dicts()
+    building.pack_surface_coordinates()
 
-    address_Es = buildingElement.findall("bldg:address/core:Address", nsmap)
-    for address_E in address_Es:
-        if cityGMLversion in ["1.0", "2.0"]:
-            _load_address_info_from_xml(building, address_E, nsmap)
-        elif cityGMLversion in ["3.0"]:
-            _load_address_info_From_xml_3_0(building, address_E, nsmap)
+    for addressProperty_E in _get_child_elements(childrenByTag, nsmap, "bldg:address"):
+        for address_E in _findall_xml_elements(
+            addressProperty_E, nsmap, "core:Address"
+        ):
+            if cityGMLversion in ["1.0", "2.0"]:
+                _load_address_info_from_xml(building, address_E, nsmap)
+            elif cityGMLversion in ["3.0"]:
+                _load_address_info_From_xml_3_0(building, address_E, nsmap)
 
 
 def _get_building_attributes_from_xml_element(
     building: AbstractBuilding,
-    buildingElement: ET.Element,
+    childrenByTag: dict,
     nsmap: dict,
     cityGMLversion: str,
 ) -> None:
-    """loads building attributes from xml Element
+    """loads building attributes from the child elements of a building element
 
     Parameters
     ----------
     building : AbstractBuilding
         either Building or BuildingPart object to add info to
-    element : ET.Element
-        either <bldg:Building> or <bldg:BuildingPart> lxml.etree element
+    childrenByTag : dict
+        child elements of the <bldg:Building> or <bldg:BuildingPart> lxml.etree
+        element grouped by their tag
     nsmap : dict
         namespace map of the root xml/gml file in form of a dicitionary
     cityGMLversion : str
         version of the CityGML file
     """
-
-    building.usage = _get_text_of_xml_element(buildingElement, nsmap, "bldg:usage")
-
-    building.function = _get_text_of_xml_element(
-        buildingElement, nsmap, "bldg:function"
-    )
-    building.roofType = _get_text_of_xml_element(
-        buildingElement, nsmap, "bldg:roofType"
-    )
-    building.storeysAboveGround = _get_int_of_xml_element(
-        buildingElement, nsmap, "bldg:storeysAboveGround"
-    )
-    building.storeyHeightsAboveGround = _get_float_of_xml_element(
-        buildingElement, nsmap, "bldg:storeyHeightsAboveGround"
-    )
-    building.storeysBelowGround = _get_int_of_xml_element(
-        buildingElement, nsmap, "bldg:storeysBelowGround"
-    )
-    building.storeyHeightsBelowGround = _get_float_of_xml_element(
-        buildingElement, nsmap, "bldg:storeyHeightsBelowGround"
-    )
+    for target, attribute, valueType in _BUILDING_ATTRIBUTES:
+        setattr(
+            building,
+            attribute,
+            _get_value_of_child_element(childrenByTag, nsmap, target, valueType),
+        )
 
     if cityGMLversion in ["1.0", "2.0"]:
-        building.creationDate = _get_text_of_xml_element(
-            buildingElement, nsmap, "core:creationDate"
-        )
+        for target, attribute, valueType in _BUILDING_ATTRIBUTES_2_0:
+            setattr(
+                building,
+                attribute,
+                _get_value_of_child_element(childrenByTag, nsmap, target, valueType),
+            )
 
-        genStrings = buildingElement.findall("gen:stringAttribute", nsmap)
+        genStrings = _get_child_elements(childrenByTag, nsmap, "gen:stringAttribute")
         for i in genStrings:
             key = i.attrib["name"]
             building.genericStrings[key] = _get_text_of_xml_element(
                 i, nsmap, "gen:value"
             )
 
-        building.yearOfConstruction = _get_int_of_xml_element(
-            buildingElement, nsmap, "bldg:yearOfConstruction"
-        )
-        building.measuredHeight = _get_float_of_xml_element(
-            buildingElement, nsmap, "bldg:measuredHeight"
-        )
     elif cityGMLversion in ["3.0"]:
-        if height_E := buildingElement.find("con:height", nsmap):
-            if height2_E := height_E.find("con:Height", nsmap):
+        height_Es = _get_child_elements(childrenByTag, nsmap, "con:height")
+        if height_Es:
+            if height2_E := _find_xml_element(height_Es[0], nsmap, "con:Height"):
                 if (
                     _get_text_of_xml_element(height2_E, nsmap, "con:highReference")
                     == "highestRoofEdge"
@@ -451,71 +759,56 @@ def _get_building_surfaces_from_xml_element(
     """
 
     if cityGMLversion in ["1.0", "2.0"]:
+        lod_Es = _get_lod_geometry_elements(element, nsmap, _LOD_GEOMETRY_PATHS_2_0)
+
         # check if building is LoD0
-        lod0FootPrint_E = element.find("bldg:lod0FootPrint", nsmap)
-        lod0RoofEdge_E = element.find("bldg:lod0RoofEdge", nsmap)
+        lod0FootPrint_E = lod_Es.get("lod0FootPrint")
+        lod0RoofEdge_E = lod_Es.get("lod0RoofEdge")
         if lod0FootPrint_E is not None or lod0RoofEdge_E is not None:
             building.lod = "0"
-            if lod0FootPrint_E is not None:
-                geometry = GeometryGML("MultiSurface", building.gml_id, 0)
-                geomKey = building.add_geometry(geometry)
-                poly_E = lod0FootPrint_E.findall(".//gml:Polygon", nsmap)
-                poly_id = _get_attrib_of_xml_element(
-                    poly_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-                )
+            geometry = GeometryGML("MultiSurface", building.gml_id, 0)
+            geomKey = building.add_geometry(geometry)
+            poly_Es = []
+            surfaceTypes = []
+            for lod0_E, surfaceType in (
+                (lod0FootPrint_E, "GroundSurface"),
+                (lod0RoofEdge_E, "RoofSurface"),
+            ):
+                if lod0_E is not None:
+                    new_Es = _findall_xml_elements(lod0_E, nsmap, ".//gml:Polygon")
+                    poly_Es.extend(new_Es)
+                    surfaceTypes.extend([surfaceType] * len(new_Es))
+            for i, (poly_E, surfaceType) in enumerate(zip(poly_Es, surfaceTypes)):
+                poly_id = poly_E.get(_GML_ID)
                 coordinates = _get_polygon_coordinates_from_element(poly_E, nsmap)
-                ground_id = poly_id if poly_id else "citydpc_poly_0"
-                newSurface = SurfaceGML(coordinates, ground_id, "GroundSurface", None)
+                poly_id = poly_id if poly_id else f"citydpc_poly_{i}"
+                newSurface = SurfaceGML(coordinates, poly_id, surfaceType)
                 if newSurface.isSurface:
                     geometry.add_surface(newSurface)
                 else:
-                    building.remove_geometry(geomKey)
-                    building._warn_invalid_surface(ground_id)
-
-            if lod0RoofEdge_E is not None:
-                geometry = GeometryGML("MultiSurface", building.gml_id, 0)
-                geomKey = building.add_geometry(geometry)
-                poly_E = lod0RoofEdge_E.findall(".//gml:Polygon", nsmap)
-                poly_id = _get_attrib_of_xml_element(
-                    poly_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-                )
-                coordinates = _get_polygon_coordinates_from_element(poly_E, nsmap)
-                roof_id = poly_id if poly_id else "citydpc_poly_0"
-                newSurface = SurfaceGML(coordinates, roof_id, "RoofSurface", None)
-                if newSurface.isSurface:
-                    building.remove_geometry(geomKey)
-                    building._warn_invalid_surface(roof_id)
-
+                    building._warn_invalid_surface(poly_id)
+            if not geometry.surfaces:
+                building.remove_geometry(geomKey)
             return
 
         # check if building is LoD1
-        lod1Solid_E = element.find("bldg:lod1Solid", nsmap)
+        lod1Solid_E = lod_Es.get("lod1Solid")
         if lod1Solid_E is not None:
             building.lod = "1"
             # get all polygons and extract their coordinates
             geometry = GeometryGML("Solid", building.gml_id, 1)
             geomKey = building.add_geometry(geometry)
 
-            poly_Es = lod1Solid_E.findall(".//gml:Polygon", nsmap)
-            for i, poly_E in enumerate(poly_Es):
-                poly_id = _get_attrib_of_xml_element(
-                    poly_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-                )
-                coordinates = _get_polygon_coordinates_from_element(poly_E, nsmap)
-                poly_id = poly_id if poly_id else f"citydpc_poly_{i}"
-                newSurface = SurfaceGML(coordinates, poly_id)
-                if newSurface.isSurface:
-                    geometry.add_surface(newSurface)
-                else:
-                    building._warn_invalid_surface(poly_id)
+            poly_Es = _findall_xml_elements(lod1Solid_E, nsmap, ".//gml:Polygon")
+            _add_lod1_surfaces_from_elements(building, poly_Es, nsmap, geometry)
 
         # everything greater than LoD1
-        solid_E = element.find("bldg:lod2Solid", nsmap)
+        solid_E = lod_Es.get("lod2Solid")
         listOfSurfaceMembers = []
         if solid_E is not None:
             geometry = GeometryGML("Solid", building.gml_id, 2)
             geomKey = building.add_geometry(geometry)
-            for sM in solid_E.findall(".//gml:surfaceMember", nsmap):
+            for sM in _findall_xml_elements(solid_E, nsmap, ".//gml:surfaceMember"):
                 listOfSurfaceMembers.append(
                     sM.attrib["{http://www.w3.org/1999/xlink}href"]
                 )
@@ -558,17 +851,17 @@ def _get_building_surfaces_from_xml_element(
         return
 
     elif cityGMLversion in ["3.0"]:
+        lod_Es = _get_lod_geometry_elements(element, nsmap, _LOD_GEOMETRY_PATHS_3_0)
+
         # check if building is LoD0
-        lod0MultiSurface = element.find("lod0MultiSurface", nsmap)
+        lod0MultiSurface = lod_Es.get("lod0MultiSurface")
         if lod0MultiSurface is not None:
             building.lod = "0"
             geometry = GeometryGML("MultiSurface", building.gml_id, 0)
             geomKey = building.add_geometry(geometry)
-            poly_Es = lod0MultiSurface.findall(".//gml:Polygon", nsmap)
+            poly_Es = _findall_xml_elements(lod0MultiSurface, nsmap, ".//gml:Polygon")
             for i, poly_E in enumerate(poly_Es):
-                poly_id = _get_attrib_of_xml_element(
-                    poly_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-                )
+                poly_id = poly_E.get(_GML_ID)
                 coordinates = _get_polygon_coordinates_from_element(poly_E, nsmap)
                 poly_id = poly_id if poly_id else f"citydpc_poly_{i}"
                 newSurface = SurfaceGML(coordinates, poly_id)
@@ -576,36 +869,29 @@ def _get_building_surfaces_from_xml_element(
                     geometry.add_surface(newSurface)
                 else:
                     building._warn_invalid_surface(poly_id)
+            if not geometry.surfaces:
+                building.remove_geometry(geomKey)
             return
 
         # check if building is LoD1
-        lod1Solid_E = element.find("lod1Solid", nsmap)
+        lod1Solid_E = lod_Es.get("lod1Solid")
         if lod1Solid_E is not None:
             building.lod = "1"
             # get all polygons and extract their coordinates
             geometry = GeometryGML("Solid", building.gml_id, 1)
             geomKey = building.add_geometry(geometry)
 
-            poly_Es = lod1Solid_E.findall(".//gml:Polygon", nsmap)
-            for i, poly_E in enumerate(poly_Es):
-                poly_id = _get_attrib_of_xml_element(
-                    poly_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-                )
-                coordinates = _get_polygon_coordinates_from_element(poly_E, nsmap)
-                poly_id = poly_id if poly_id else f"citydpc_poly_{i}"
-                newSurface = SurfaceGML(coordinates, poly_id)
-                if newSurface.isSurface:
-                    geometry.add_surface(newSurface)
-                else:
-                    building._warn_invalid_surface(poly_id)
+            poly_Es = _findall_xml_elements(lod1Solid_E, nsmap, ".//gml:Polygon")
+            _add_lod1_surfaces_from_elements(building, poly_Es, nsmap, geometry)
             return
 
         # everything greater than LoD1
-        solid_E = element.find("lod2Solid", nsmap)
+        solid_E = lod_Es.get("lod2Solid")
+        listOfSurfaceMembers = []
         if solid_E is not None:
             geometry = GeometryGML("Solid", building.gml_id, 2)
             geomKey = building.add_geometry(geometry)
-            for sM in solid_E.findall(".//gml:surfaceMember", nsmap):
+            for sM in _findall_xml_elements(solid_E, nsmap, ".//gml:surfaceMember"):
                 listOfSurfaceMembers.append(
                     sM.attrib["{http://www.w3.org/1999/xlink}href"]
                 )
@@ -649,6 +935,92 @@ def _get_building_surfaces_from_xml_element(
         logger.error(f"CityGML version {cityGMLversion} not supported")
 
 
+def _get_lod_geometry_elements(
+    element: ET.Element, nsmap: dict, paths: str
+) -> dict[str, ET.Element]:
+    """returns the lod geometry child elements of a building in one search
+
+    Parameters
+    ----------
+    element : ET.Element
+        either <bldg:Building> or <bldg:BuildingPart> lxml.etree element
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    paths : str
+        '|' separated paths of the lod geometry elements
+
+    Returns
+    -------
+    dict[str, ET.Element]
+        first element of each found lod geometry by its local tag name
+    """
+    lod_Es = {}
+    for lod_E in _findall_xml_elements(element, nsmap, paths):
+        lod_Es.setdefault(ET.QName(lod_E).localname, lod_E)
+    return lod_Es
+
+
+def _add_lod1_surfaces_from_elements(
+    building: AbstractBuilding,
+    poly_Es: list[ET.Element],
+    nsmap: dict,
+    geometry: GeometryGML,
+) -> None:
+    """creates surfaces from the polygons of a LoD1 solid
+
+    the polygon with the lowest average height is used as GroundSurface and the
+    polygon with the highest average height as RoofSurface, all other polygons
+    are categorized by their orientation
+
+    Parameters
+    ----------
+    building : AbstractBuilding
+        either Building or BuildingPart object to add info to
+    poly_Es : list[ET.Element]
+        list of <gml:Polygon> lxml.etree elements of the solid
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    geometry : GeometryGML
+        geometry to add surfaces to
+    """
+    poly_ids = []
+    coordinatesList = []
+    for i, poly_E in enumerate(poly_Es):
+        poly_id = poly_E.get(_GML_ID)
+        poly_ids.append(poly_id if poly_id else f"citydpc_poly_{i}")
+        coordinatesList.append(_get_polygon_coordinates_from_element(poly_E, nsmap))
+
+    surfaceTypes = [None] * len(coordinatesList)
+    # polygons without complete 3D points can not be used for the average height
+    valid = [
+        i
+        for i, coordinates in enumerate(coordinatesList)
+        if len(coordinates) > 0 and len(coordinates) % 3 == 0
+    ]
+    if len(valid) > 1:
+        # polygons with the same number of points are stacked and averaged at
+        # once, each row is reduced like coordinates[2::3].mean()
+        zMeans = np.empty(len(valid), dtype=np.float64)
+        indicesByLength = {}
+        for j, i in enumerate(valid):
+            indicesByLength.setdefault(len(coordinatesList[i]), []).append(j)
+        for indices in indicesByLength.values():
+            heights = np.stack([coordinatesList[valid[j]] for j in indices])[:, 2::3]
+            zMeans[indices] = np.ascontiguousarray(heights).mean(axis=1)
+        if zMeans.argmin() != zMeans.argmax():
+            surfaceTypes[valid[zMeans.argmin()]] = "GroundSurface"
+            surfaceTypes[valid[zMeans.argmax()]] = "RoofSurface"
+
+    for poly_id, coordinates, surfaceType in zip(
+        poly_ids, coordinatesList, surfaceTypes
+    ):
+        newSurface = SurfaceGML(coordinates, poly_id, surfaceType)
+        if newSurface.isSurface:
+            geometry.add_surface(newSurface)
+        else:
+            building._warn_invalid_surface(poly_id)
+
+
 def _get_polygon_coordinates_from_element(
     polygon_element: ET.Element, nsmap: dict
 ) -> np.array:
@@ -669,17 +1041,65 @@ def _get_polygon_coordinates_from_element(
     np.array
        1D numpy array of coordinates
     """
-    polyStr = []
+    polyStr = _get_polygon_coordinates_text(polygon_element, nsmap)
+    return np.round(np.fromstring(polyStr, dtype=np.float64, sep=" "), 3)
+
+
+def _get_polygon_coordinates_from_elements(
+    polygon_elements: list[ET.Element], nsmap: dict
+) -> list[np.array]:
+    """search multiple elements for coordinates
+
+    same as _get_polygon_coordinates_from_element for every element, but the
+    coordinates of all elements are rounded in one contiguous array and the
+    returned arrays are views into it
+
+    Parameters
+    ----------
+    polygon_elements : list[ET.Element]
+        list of <gml:polygon> lxml.etree elements
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+
+    Returns
+    -------
+    list[np.array]
+       1D numpy array of coordinates for every element
+    """
+    if not polygon_elements:
+        return []
+    coordinates = [
+        np.fromstring(
+            _get_polygon_coordinates_text(polygon_E, nsmap), dtype=np.float64, sep=" "
+        )
+        for polygon_E in polygon_elements
+    ]
+    offsets = np.cumsum([len(coords) for coords in coordinates])
+    return np.split(np.round(np.concatenate(coordinates), 3), offsets[:-1])
+
+
+def _get_polygon_coordinates_text(polygon_element: ET.Element, nsmap: dict) -> str:
+    """returns the coordinates of the element as a whitespace separated string
+
+    Parameters
+    ----------
+    polygon_element : ET.Element
+        <gml:polygon> lxml.etree element
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+
+    Returns
+    -------
+    str
+        text of the gml:posList or the joined texts of the gml:pos elements
+    """
     # searching for list of coordinates
-    posList_E = polygon_element.find(".//gml:posList", nsmap)
+    posList_E = _find_xml_element(polygon_element, nsmap, ".//gml:posList")
     if posList_E is not None:
-        polyStr = posList_E.text.strip().split(" ")
-    else:
-        # searching for individual coordinates in polygon
-        pos_Es = polygon_element.findall(".//gml:pos", nsmap)
-        for pos_E in pos_Es:
-            polyStr.extend(pos_E.text.strip().split(" "))
-    return np.array([round(float(x), 3) for x in polyStr])
+        return posList_E.text
+    # searching for individual coordinates in polygon
+    pos_Es = _findall_xml_elements(polygon_element, nsmap, ".//gml:pos")
+    return " ".join([pos_E.text for pos_E in pos_Es])
 
 
 def _add_surface_from_element(
@@ -708,15 +1128,18 @@ def _add_surface_from_element(
     """
     if not id_str:
         id_str = building.gml_id + "_" + target_str.split(":")[-1]
-    for i, surface_E in enumerate(element.findall(target_str, nsmap)):
-        id = _get_attrib_of_xml_element(
-            surface_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-        )
-        poly_E = surface_E.find(".//gml:Polygon", nsmap)
-        poly_id = _get_attrib_of_xml_element(
-            poly_E, nsmap, ".", "{http://www.opengis.net/gml}id"
-        )
-        coordinates = _get_polygon_coordinates_from_element(poly_E, nsmap)
+    surface_Es = _findall_xml_elements(element, nsmap, target_str)
+    poly_Es = [
+        _find_xml_element(surface_E, nsmap, ".//gml:Polygon")
+        for surface_E in surface_Es
+    ]
+    # coordinates of all surfaces are extracted in one pass
+    allCoordinates = _get_polygon_coordinates_from_elements(poly_Es, nsmap)
+    for i, (surface_E, poly_E, coordinates) in enumerate(
+        zip(surface_Es, poly_Es, allCoordinates)
+    ):
+        id = surface_E.get(_GML_ID)
+        poly_id = poly_E.get(_GML_ID)
         used_id = id if id else f"citydpc_{id_str}_{i}"
         newSurface = SurfaceGML(
             coordinates, used_id, target_str.rsplit(":")[-1], poly_id
@@ -747,7 +1170,7 @@ def _get_text_of_xml_element(
         returns either the value as a string or None
     """
     try:
-        res_E = element.find(target, nsmap)
+        res_E = _find_xml_element(element, nsmap, target)
     except:
         logger.error(f"Unable to find {target} in {element}")
         return None
@@ -756,6 +1179,88 @@ def _get_text_of_xml_element(
     return None
 
 
+def _group_child_elements_by_tag(element: ET.Element) -> dict:
+    """groups the direct child elements of element by their tag
+
+    Parameters
+    ----------
+    element : ET.Element
+        parent lxml.etree element
+
+    Returns
+    -------
+    dict
+        tag as key and list of child elements in document order as value
+    """
+    childrenByTag = {}
+    for child_E in element:
+        childrenByTag.setdefault(child_E.tag, []).append(child_E)
+    return childrenByTag
+
+
+def _get_child_elements(
+    childrenByTag: dict, nsmap: dict, target: str
+) -> list[ET.Element]:
+    """returns the direct child elements with the target tag
+
+    Parameters
+    ----------
+    childrenByTag : dict
+        child elements of the parent element grouped by their tag
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    target : str
+        prefixed target element name
+
+    Returns
+    -------
+    list[ET.Element]
+        list of matching elements
+    """
+    return childrenByTag.get(_get_qualified_tag(target, nsmap), [])
+
+
+def _get_value_of_child_element(
+    childrenByTag: dict, nsmap: dict, target: str, valueType: type = str
+) -> str | int | float | None:
+    """gets the value of the first direct child element with the target tag
+
+    same as _get_text_of_xml_element, _get_int_of_xml_element and
+    _get_float_of_xml_element, but for already grouped child elements
+
+    Parameters
+    ----------
+    childrenByTag : dict
+        child elements of the parent element grouped by their tag
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    target : str
+        prefixed target element name
+    valueType : type, optional
+        type to convert the text to, by default str
+
+    Returns
+    -------
+    str | int | float | None
+        returns either the converted value or None
+    """
+    try:
+        res_Es = _get_child_elements(childrenByTag, nsmap, target)
+    except KeyError:
+        logger.error(f"Unable to find {target}")
+        return None
+    if not res_Es or res_Es[0].text is None:
+        return None
+    res = res_Es[0].text
+    if valueType is str:
+        return res
+    try:
+        return valueType(res)
+    except:
+        logger.error(f"Unable to convert {res} to {valueType.__name__}")
+    return None
+
+
 def _get_float_of_xml_element(
     element: ET.Element, nsmap: dict, target: str
 ) -> float | None:
@@ -834,11 +1339,187 @@ def _get_attrib_of_xml_element(
         returns either the attribute value as a string or None
     """
     try:
-        res_E = element.find(target, nsmap)
+        res_E = _find_xml_element(element, nsmap, target)
     except:
         logger.error(f"Unable to find {target} in {element}")
         return None
     if res_E is not None:
-        if attrib in res_E.attrib.keys():
-            return res_E.attrib[attrib]
+        return res_E.get(attrib)
     return None
+
+
+# number of compiled XPath expressions and qualified tags kept per namespace map
+_XPATH_CACHE_SIZE = 1024
+# paths searching for all descendants with a single prefixed tag
+_DESCENDANT_PATH = re.compile(r"\.//(\w+):(\w+)")
+
+
+def _get_qualified_tag(target: str, nsmap: dict) -> str:
+    """returns the tag of a prefixed element name in Clark notation
+
+    Parameters
+    ----------
+    target : str
+        prefixed element name, e.g. 'bldg:function'
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+
+    Returns
+    -------
+    str
+        tag in Clark notation, e.g. '{http://www.opengis.net/gml}pos'
+    """
+    return _qualify_tag(target, frozenset(nsmap.items()))
+
+
+@functools.lru_cache(maxsize=_XPATH_CACHE_SIZE)
+def _qualify_tag(target: str, nsmapItems: frozenset) -> str:
+    """cached implementation of _get_qualified_tag
+
+    Parameters
+    ----------
+    target : str
+        prefixed element name, e.g. 'bldg:function'
+    nsmapItems : frozenset
+        items of the namespace map, hashable key of the cache
+
+    Returns
+    -------
+    str
+        tag in Clark notation, e.g. '{http://www.opengis.net/gml}pos'
+    """
+    prefix, name = target.split(":")
+    return f"{{{dict(nsmapItems)[prefix]}}}{name}"
+
+
+def _get_xpath(path: str, nsmap: dict) -> ET.XPath:
+    """returns a compiled lxml XPath expression for path
+
+    expressions are compiled once per path and namespace map and reused,
+    searches for descendants with a single tag (e.g. './/gml:pos') walk the
+    tree with iterdescendants instead
+
+    Parameters
+    ----------
+    path : str
+        prefixed ElementPath-like path, e.g. 'bldg:boundedBy/bldg:WallSurface',
+        multiple paths can be combined with '|'
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+
+    Returns
+    -------
+    ET.XPath
+        compiled XPath expression (or equivalent callable)
+    """
+    return _compile_xpath(path, frozenset(nsmap.items()))
+
+
+@functools.lru_cache(maxsize=_XPATH_CACHE_SIZE)
+def _compile_xpath(path: str, nsmapItems: frozenset) -> ET.XPath:
+    """cached implementation of _get_xpath
+
+    Parameters
+    ----------
+    path : str
+        prefixed ElementPath-like path, e.g. 'bldg:boundedBy/bldg:WallSurface',
+        multiple paths can be combined with '|'
+    nsmapItems : frozenset
+        items of the namespace map, hashable key of the cache
+
+    Returns
+    -------
+    ET.XPath
+        compiled XPath expression (or equivalent callable)
+    """
+    nsmap = dict(nsmapItems)
+    namespaces = {key: value for key, value in nsmap.items() if key is not None}
+    descendant = _DESCENDANT_PATH.fullmatch(path)
+    if descendant is not None and descendant.group(1) in namespaces:
+        return _get_descendant_finder(
+            f"{{{namespaces[descendant.group(1)]}}}{descendant.group(2)}"
+        )
+    xpathStr = path
+    if None in nsmap:
+        # find() applies the default namespace to unprefixed names,
+        # XPath needs an explicit prefix for that
+        namespaces["_default"] = nsmap[None]
+        xpathStr = " | ".join(
+            "/".join(
+                (
+                    f"_default:{step}"
+                    if step not in ["", ".", "..", "*"] and ":" not in step
+                    else step
+                )
+                for step in subPath.strip().split("/")
+            )
+            for subPath in path.split("|")
+        )
+    return ET.XPath(xpathStr, namespaces=namespaces)
+
+
+def _get_descendant_finder(tag: str):
+    """returns a function listing all descendants of an element with tag
+
+    Parameters
+    ----------
+    tag : str
+        tag in Clark notation, e.g. '{http://www.opengis.net/gml}pos'
+
+    Returns
+    -------
+    function
+        takes an element and returns a list of its descendants with tag
+    """
+
+    def find_descendants(element: ET.Element) -> list[ET.Element]:
+        return list(element.iterdescendants(tag))
+
+    return find_descendants
+
+
+def _find_xml_element(
+    element: ET.Element, nsmap: dict, target: str
+) -> ET.Element | None:
+    """returns the first element matching target, same as element.find()
+
+    Parameters
+    ----------
+    element : ET.Element
+        parent lxml.etree element of target element
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    target : str
+        prefixed target element path
+
+    Returns
+    -------
+    ET.Element | None
+        first matching element or None
+    """
+    res = _get_xpath(target, nsmap)(element)
+    if res:
+        return res[0]
+    return None
+
+
+def _findall_xml_elements(
+    element: ET.Element, nsmap: dict, target: str
+) -> list[ET.Element]:
+    """returns all elements matching target, same as element.findall()
+
+    Parameters
+    ----------
+    element : ET.Element
+        parent lxml.etree element of target elements
+    nsmap : dict
+        namespace map of the root xml/gml file in form of a dicitionary
+    target : str
+        prefixed target element path
+
+    Returns
+    -------
+    list[ET.Element]
+        list of matching elements
+    """
+    return _get_xpath(target, nsmap)(element)
@@ -177,7 +177,7 @@ def _process_building(
                     _load_building_information_from_json(
                         new_building_part, cityObjects[child], vertices
                     )
-                    new_building.building_parts.append(new_building_part)
+                    new_building.add_building_part(new_building_part)
                 else:
                     logger.warning(
                         f"Child ({child}) of building ({building_id}) "
@@ -405,7 +405,7 @@ def _transform_vertices(
     ignoreExistingTransform: bool,
 ) -> list[list[float]]:
     if (
-        dataset.transform == {}
+        not dataset.transform
         or dataset.transform == {"scale": [1, 1, 1], "translate": [0, 0, 0]}
         or ignoreExistingTransform
     ):
@@ -425,7 +425,7 @@ def _transform_vertices(
                 + data["transform"]["translate"][2],
                 3,
             )
-        if dataset.transform == {}:
+        if not dataset.transform:
             dataset.transform = data["transform"]
     else:
         raise ValueError(
@@ -482,7 +482,7 @@ def _load_building_information_from_json(
                     setattr(address, objAttributes[key], value)
             building.addressCollection.add_address(address)
 
-    if "geometry" in jsonDict.keys() and jsonDict["geometry"] != []:
+    if "geometry" in jsonDict.keys() and jsonDict["geometry"]:
         for geometry in jsonDict["geometry"]:
             geometryObj = GeometryGML(
                 geometry["type"],
@@ -547,6 +547,7 @@ def _load_building_information_from_json(
         if CALC_ROOF_VOLUME_ON_IMPORT:
             building._calc_roof_volume()
         building.create_legacy_surface_dicts()
+        building.pack_surface_coordinates()
 
 
 def _add_cityjson_surface_to_building(
@@ -9,7 +9,6 @@ from citydpc.core.object.address import AddressCollection
 from citydpc.logger import logger
 
 import numpy as np
-from scipy.spatial import ConvexHull
 
 
 class AbstractBuilding:
@@ -36,6 +35,11 @@ class AbstractBuilding:
         self.is_building_part = None
         self.allWalls = None
         self.freeWalls = None
+        # contiguous (M, 3) array of the coordinates of all surfaces and the
+        # offsets of each surface of get_surfaces() into it,
+        # see pack_surface_coordinates
+        self.surfaceCoordinates = None
+        self.surfaceOffsets = None
 
         self.creationDate = None
         self.extRef_infromationsSystem = None
@@ -72,11 +76,11 @@ class AbstractBuilding:
         for geometry in self.get_geometries():
             if (
                 geometry is not None
-                and geometry.get_surfaces(["RoofSurface"]) != []
-                and geometry.get_surfaces(["GroundSurface"]) != []
+                and geometry.get_surfaces(["RoofSurface"])
+                and geometry.get_surfaces(["GroundSurface"])
                 and (
-                    geometry.get_surfaces(["WallSurface"]) != []
-                    or geometry.get_surfaces(["ClosureSurface"]) != []
+                    geometry.get_surfaces(["WallSurface"])
+                    or geometry.get_surfaces(["ClosureSurface"])
                 )
             ):
                 return True
@@ -162,10 +166,10 @@ class AbstractBuilding:
         """
         surfaces = []
         for key, geometry in self.geometries.items():
-            if geometryKeys != [] and key not in geometryKeys:
+            if geometryKeys and key not in geometryKeys:
                 continue
             for surface in geometry.surfaces:
-                if surfaceTypes == [] or surface.surface_type in surfaceTypes:
+                if not surfaceTypes or surface.surface_type in surfaceTypes:
                     surfaces.append(surface)
 
         return surfaces
@@ -185,7 +189,7 @@ class AbstractBuilding:
         """
         geometries = []
         for key, geometry in self.geometries.items():
-            if geometryKeys != [] and key not in geometryKeys:
+            if geometryKeys and key not in geometryKeys:
                 continue
             geometries.append(geometry)
 
@@ -195,30 +199,52 @@ class AbstractBuilding:
         """calculates the roof volume of the building"""
         return
         roofSurfaces = self.get_surfaces(["RoofSurface"])
-        if roofSurfaces != []:
+        if roofSurfaces:
             self.roof_volume = 0
+            roofArrays = []
             for roof_surface in roofSurfaces:
-                if np.all(
-                    roof_surface.gml_surface_2array
-                    == roof_surface.gml_surface_2array[0, :],
-                    axis=0,
-                )[2]:
+                if np.ptp(roof_surface.gml_surface_2array[:, 2]) == 0:
                     # roof surface is flat -> no volume to calculate
                     continue
-                minimum_roof_height = np.min(roof_surface.gml_surface_2array, axis=0)[2]
-                maximum_roof_height = np.max(roof_surface.gml_surface_2array, axis=0)[2]
-                closing_points = np.array(roof_surface.gml_surface_2array, copy=True)
-                closing_points[:, 2] = minimum_roof_height
-                closed = np.concatenate(
-                    [closing_points, roof_surface.gml_surface_2array]
-                )
-                hull = ConvexHull(closed)
-                self.roof_volume += round(hull.volume, 3)
-                if (
-                    self.roof_height is None
-                    or maximum_roof_height - minimum_roof_height > self.roof_height
-                ):
-                    self.roof_height = maximum_roof_height - minimum_roof_height
+                roofArrays.append(roof_surface.gml_surface_2array)
+
+            if not roofArrays:
+                return
+
+            volumes, heights = _calc_roof_prism_volumes(roofArrays)
+            self.roof_volume += float(np.sum(np.round(volumes, 3)))
+            self.roof_height = float(np.max(heights))
+
+    def pack_surface_coordinates(self) -> None:
+        """stores the coordinates of all surfaces in one contiguous array
+
+        the coordinates of the i-th surface of get_surfaces() are
+        surfaceCoordinates[surfaceOffsets[i] : surfaceOffsets[i + 1]], the
+        gml_surface_2array attributes of the surfaces become views into
+        surfaceCoordinates, so in-place changes of them also change
+        surfaceCoordinates (but not gml_surface, which is left unchanged). To
+        change the coordinates of a surface assign new arrays to gml_surface and
+        gml_surface_2array and call this again, same after surfaces are added
+        """
+        surfaces = self.get_surfaces()
+        if not surfaces:
+            self.surfaceCoordinates = None
+            self.surfaceOffsets = None
+            return
+
+        self.surfaceOffsets = np.zeros(len(surfaces) + 1, dtype=np.int64)
+        np.cumsum(
+            [len(surface.gml_surface_2array) for surface in surfaces],
+            out=self.surfaceOffsets[1:],
+        )
+        self.surfaceCoordinates = np.concatenate(
+            [surface.gml_surface_2array for surface in surfaces]
+        ).astype(np.float64, copy=False)
+        for i, surface in enumerate(surfaces):
+            coordinates = self.surfaceCoordinates[
+                self.surfaceOffsets[i] : self.surfaceOffsets[i + 1]
+            ]
+            surface.gml_surface_2array = coordinates
 
     def _warn_invalid_surface(self, surfaceID: str) -> None:
         """logs warning about invalid surface
@@ -248,7 +274,55 @@ class AbstractBuilding:
         }
         for dictName, surfaceType in dictNames.items():
             surfaces = self.get_surfaces([surfaceType])
-            if surfaces != []:
+            if surfaces:
                 setattr(self, dictName, {})
                 for surface in surfaces:
                     getattr(self, dictName)[surface.surface_id] = surface
+
+
+def _calc_roof_prism_volumes(
+    roofArrays: list[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """calculates the volume between each roof surface and the horizontal plane
+    at the lowest point of the respective roof surface
+
+    the roof surfaces are stacked into one padded array and the volumes are
+    calculated as the sum of triangular prisms under a triangle fan of each
+    surface (divergence theorem with the field (0, 0, z - zMin), where the
+    vertical walls and the floor do not contribute). This also holds for
+    surfaces that are not convex
+
+    Parameters
+    ----------
+    roofArrays : list[np.ndarray]
+        list of (N, 3) coordinate arrays of roof surfaces
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        array of volumes and array of heights (max z - min z) per roof surface
+    """
+    numOfPoints = np.array([len(roofArray) for roofArray in roofArrays])
+    maxNumOfPoints = numOfPoints.max()
+    mask = np.arange(maxNumOfPoints) < numOfPoints[:, None]
+
+    # pad with the first point of each polygon -> padded triangles have no area
+    firstPoints = np.array([roofArray[0] for roofArray in roofArrays], dtype=float)
+    padded = np.repeat(firstPoints[:, None, :], maxNumOfPoints, axis=1)
+    padded[mask] = np.concatenate(roofArrays)
+
+    zMin = padded[:, :, 2].min(axis=1)
+    heights = padded[:, :, 2].max(axis=1) - zMin
+
+    # signed x-y area and mean height above zMin of each fan triangle
+    p0 = padded[:, :1]
+    p1 = padded[:, 1:-1]
+    p2 = padded[:, 2:]
+    areas = 0.5 * (
+        (p1[..., 0] - p0[..., 0]) * (p2[..., 1] - p0[..., 1])
+        - (p1[..., 1] - p0[..., 1]) * (p2[..., 0] - p0[..., 0])
+    )
+    meanHeights = (p0[..., 2] + p1[..., 2] + p2[..., 2]) / 3 - zMin[:, None]
+    volumes = np.abs(np.sum(areas * meanHeights, axis=1))
+
+    return volumes, heights
@@ -1,6 +1,31 @@
 class CoreAddress:
     """object representing a core:Address element"""
 
+    # fixed set of attributes, no instance dict per address
+    __slots__ = (
+        "gml_id",
+        "countryName",
+        "locality_type",
+        "localityName",
+        "thoroughfare_type",
+        "thoroughfareNumber",
+        "thoroughfareName",
+        "postalCodeNumber",
+    )
+
+    # attributes that can be used to restrict addresses
+    ADDRESS_KEYS = frozenset(
+        [
+            "countryName",
+            "locality_type",
+            "localityName",
+            "thoroughfare_type",
+            "thoroughfareNumber",
+            "thoroughfareName",
+            "postalCodeNumber",
+        ]
+    )
+
     def __init__(self) -> None:
         self.gml_id = None
 
@@ -29,27 +54,8 @@ class CoreAddress:
         """
 
         for key, value in addressRestriciton.items():
-            if key == "countryName":
-                if self.countryName != value:
-                    return False
-            elif key == "locality_type":
-                if self.locality_type != value:
-                    return False
-            elif key == "localityName":
-                if self.localityName != value:
-                    return False
-            elif key == "thoroughfare_type":
-                if self.thoroughfare_type != value:
-                    return False
-            elif key == "thoroughfareNumber":
-                if self.thoroughfareNumber != value:
-                    return False
-            elif key == "thoroughfareName":
-                if self.thoroughfareName != value:
-                    return False
-            elif key == "postalCodeNumber":
-                if self.postalCodeNumber != value:
-                    return False
+            if key in self.ADDRESS_KEYS and getattr(self, key) != value:
+                return False
 
         return True
 
@@ -106,6 +112,12 @@ class AddressCollection:
             True:  building address matches restrictions
             False: building address does not match restrictions
         """
+        # unknown keys are ignored, so only filter them once for all addresses
+        addressRestriciton = {
+            key: value
+            for key, value in addressRestriciton.items()
+            if key in CoreAddress.ADDRESS_KEYS
+        }
         for address in self.addresses:
             res = address.check_address(addressRestriciton)
             if res:
@@ -29,7 +29,17 @@ class Building(AbstractBuilding):
         bool
             true if building has building parts
         """
-        return self.building_parts != []
+        return bool(self.building_parts)
+
+    def add_building_part(self, buildingPart: BuildingPart) -> None:
+        """adds a building part to the building
+
+        Parameters
+        ----------
+        buildingPart : BuildingPart
+            building part to be added
+        """
+        self.building_parts.append(buildingPart)
 
     def get_building_parts(self) -> list[BuildingPart]:
         """return a list of building parts of building
@@ -49,4 +59,4 @@ class Building(AbstractBuilding):
         list
             all building part ids of building
         """
-        return [x.id for x in self.building_parts]
+        return [x.gml_id for x in self.building_parts]
@@ -30,6 +30,8 @@ class GeometryGML:
         self.lod = lod
         self.surfaces = []
         self.solids = {}
+        # surfaces by surface_id for duplicate checks and lookups
+        self._surfacesById = {}
 
     def add_surface(
         self,
@@ -43,15 +45,14 @@ class GeometryGML:
         surface : SurfaceGML
             surface to be added
         """
-        if (
-            surface.surface_id is not None
-            and surface.surface_id in self.get_all_surface_ids()
-        ):
-            logger.error(
-                f"Surface with id {surface.surface_id} already present on "
-                + f"{self.parentID}"
-            )
-            return
+        if surface.surface_id is not None:
+            if surface.surface_id in self._surfacesById:
+                logger.error(
+                    f"Surface with id {surface.surface_id} already present on "
+                    + f"{self.parentID}"
+                )
+                return
+            self._surfacesById[surface.surface_id] = surface
 
         self.surfaces.append(surface)
 
@@ -96,7 +97,7 @@ class GeometryGML:
         """
         surfaces = []
         for surface in self.surfaces:
-            if surfaceTypes == [] or surface.surface_type in surfaceTypes:
+            if not surfaceTypes or surface.surface_type in surfaceTypes:
                 surfaces.append(surface)
 
         return surfaces
@@ -114,9 +115,8 @@ class GeometryGML:
         SurfaceGML
             surface with the given id
         """
-        for surface in self.surfaces:
-            if surface.surface_id == surface_id:
-                return surface
+        if surface_id in self._surfacesById:
+            return self._surfacesById[surface_id]
 
         logger.error(
             f"surface with id {surface_id} not found on geometry of {self.parentID}"
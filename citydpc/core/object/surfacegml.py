@@ -44,16 +44,8 @@ class SurfaceGML(object):
         self.surface_tilt = None
         self.normal_uni = None
 
-        useless_points = []
         split_surface = list(zip(*[iter(self.gml_surface)] * 3))
-        for three_points in self.n_wise(split_surface, 3):
-            useless_points.append(
-                self.check_if_points_on_line(
-                    np.asarray(three_points[1]),
-                    np.asarray(three_points[0]),
-                    np.asarray(three_points[2]),
-                )
-            )
+        useless_points = self.get_points_on_line(split_surface)
         for element in split_surface:
             if element in useless_points:
                 split_surface.remove(element)
@@ -237,15 +229,10 @@ class SurfaceGML(object):
 
         if len(poly) < 3:  # not a plane - no area
             return 0
-        total = [0, 0, 0]
-        length = len(poly)
-        for i in range(length):
-            vi1 = poly[i]
-            vi2 = poly[(i + 1) % length]
-            prod = np.cross(vi1, vi2)
-            total[0] += prod[0]
-            total[1] += prod[1]
-            total[2] += prod[2]
+        # cross products of all consecutive points (closing the ring) at once,
+        # summed up point by point along axis 0
+        points = np.asarray(poly)
+        total = np.cross(points, np.roll(points, -1, axis=0)).sum(axis=0)
         result = np.dot(total, self.unit_normal(poly[0], poly[1], poly[2]))
         return abs(result / 2)
 
@@ -257,6 +244,50 @@ class SurfaceGML(object):
                 next(iterable_list[i], None)
         return zip(*iterable_list)
 
+    @staticmethod
+    def get_points_on_line(split_surface):
+        """returns all points lying on the line between their neighbours
+
+        vectorized version of check_if_points_on_line for all consecutive
+        point triples of a surface
+
+        Parameters
+        ----------
+
+        split_surface : list
+            list of points with srsDimension = 3
+
+        Returns
+        ----------
+
+        useless_points : list
+            list of point tuples that lie on a line
+        """
+        if len(split_surface) < 3:
+            return []
+        points = np.asarray(split_surface, dtype=np.float64)
+        a = points[:-2]
+        p = points[1:-1]
+        b = points[2:]
+
+        # normalized tangent vectors
+        d = (b - a) / np.linalg.norm(b - a, axis=1)[:, np.newaxis]
+
+        # signed parallel distance components
+        s = np.einsum("ij,ij->i", a - p, d)
+        t = np.einsum("ij,ij->i", p - b, d)
+
+        # clamped parallel distance
+        h = np.maximum(np.maximum(s, t), 0)
+
+        # perpendicular distance component
+        c = np.cross(p - a, d)
+        onLine = (
+            np.hypot(h, np.linalg.norm(c, axis=1))
+            <= SurfaceConfig.DISTANCE_BETWEEN_LINE_AND_POINT
+        )
+        return [tuple(point) for point in p[onLine]]
+
     @staticmethod
     def check_if_points_on_line(p, a, b):
         # normalized tangent vector
@@ -79,7 +79,7 @@ def write_cityjson_file(
         dataset, identifier, pointOfContact, referenceDate, referenceSystem, title
     )
 
-    if dataset.transform != {}:
+    if dataset.transform:
         transfromOld = dataset.transform
     else:
         transfromOld = {"scale": [1, 1, 1], "translate": [0, 0, 0]}
@@ -164,7 +164,7 @@ def __create_metadata_dict(
     metadata["geographicalExtent"] = None
     if identifier is not None:
         metadata["identifier"] = identifier
-    if pointOfContact != {}:
+    if pointOfContact:
         metadata["pointOfContact"] = pointOfContact
     if referenceDate is not None:
         metadata["referenceDate"] = referenceDate
@@ -46,6 +46,8 @@ class Dataset:
     def get_building_list(self) -> list[Building]:
         """returns a list of all buildings in dataset
 
+        a new list is created on every call, so call it once outside of loops
+
         Returns
         -------
         list
@@ -5,6 +5,7 @@ if TYPE_CHECKING:
     from citydpc.dataset import Dataset
     from citydpc.core.object.abstractBuilding import AbstractBuilding
     from citydpc.core.object.building import Building
+    from citydpc.core.object.surfacegml import SurfaceGML
 
 import numpy as np
 import matplotlib.path as mplP
@@ -16,8 +17,8 @@ def analysis(dataset: Dataset) -> dict[dict]:
 
     Parameters
     ----------
-    data : Dataset
-        CityPY dataset object
+    dataset : Dataset
+        cityDPC dataset object
 
     Returns
     -------
@@ -44,21 +45,17 @@ def analysis(dataset: Dataset) -> dict[dict]:
             fileResult["gml_name"] = singleFile.identifier
         fileResult["crs"] = singleFile.srsName
 
-        all_LoDs = []
+        all_LoDs = set()
         buildingPart_counter = 0
         for building_id in singleFile.building_ids:
             building = dataset.buildings[building_id]
-            for geometry in building.get_geometries():
-                if str(geometry.lod) not in all_LoDs:
-                    all_LoDs.append(str(geometry.lod))
-            if building.has_building_parts():
-                for buildingPart in building.building_parts:
-                    buildingPart_counter -= -1
-                    for geometry in buildingPart.get_geometries():
-                        if str(geometry.lod) not in all_LoDs:
-                            all_LoDs.append(str(geometry.lod))
-        all_LoDs.sort()
-        fileResult["gml_lod"] = ", ".join(all_LoDs)
+            all_LoDs.update(str(geometry.lod) for geometry in building.get_geometries())
+            for buildingPart in building.building_parts:
+                buildingPart_counter += 1
+                all_LoDs.update(
+                    str(geometry.lod) for geometry in buildingPart.get_geometries()
+                )
+        fileResult["gml_lod"] = ", ".join(sorted(all_LoDs))
 
         fileResult["ade"] = ", ".join(singleFile.ades)
         numOfBuilding = len(singleFile.building_ids)
@@ -112,14 +109,14 @@ def search_dataset(
 
     toDelete = []
     uncheckedBIDs = list(newDataset.buildings.keys())
-    for building_id in uncheckedBIDs:
+    if border is not None:
+        inBorder = check_if_buildings_in_coordinates(
+            newDataset.get_building_list(), borderCoordinates, border
+        )
+    for i, building_id in enumerate(uncheckedBIDs):
 
         if border is not None:
-            res = check_if_building_in_coordinates(
-                newDataset.buildings[building_id], borderCoordinates, border
-            )
-
-            if not res:
+            if not inBorder[i]:
                 toDelete.append(building_id)
                 continue
 
@@ -156,20 +153,95 @@ def check_if_building_in_coordinates(
     bool
         True if building of any building part is within borderCoordinates
     """
+    # the building and all of its parts are checked in one vectorized pass
+    return bool(
+        check_if_buildings_in_coordinates([building], borderCoordinates, border)[0]
+    )
+
+
+def check_if_buildings_in_coordinates(
+    buildings: list[Building], borderCoordinates: list, border: mplP.Path = None
+) -> np.ndarray:
+    """checks for multiple buildings if a building or any of its building parts
+    are located inside the given borderCoordinates
+
+    same result as calling check_if_building_in_coordinates for every building,
+    but the vertices of all buildings are tested against the border at once
+
+    Parameters
+    ----------
+    buildings : list[Building]
+        list of buildings to check
+    borderCoordinates : list
+        a 2D array of 2D coordinates
+    border : mplP.Path, optional
+        borderCoordinates as a matplotlib.path.Path, by default None
+
+    Returns
+    -------
+    np.ndarray
+        boolean array, True if building or any building part is within
+        borderCoordinates
+    """
     if border is None:
         border = mplP.Path(np.array(borderCoordinates))
 
-    # check for the geometry of the building itself
-    res = _check_if_within_border(building, borderCoordinates, border)
-    if res:
-        return True
+    surfacesOfBuildings = []
+    allPoints = []
+    buildingIndex = []
+    for i, building in enumerate(buildings):
+        surfaces = []
+        for buildingLike in [building] + building.get_building_parts():
+            refSurfaces = _get_border_reference_surfaces(buildingLike)
+            if refSurfaces is not None:
+                surfaces.extend(refSurfaces)
+        for surface in surfaces:
+            allPoints.append(surface.gml_surface_2array[:, :2])
+            buildingIndex.append(np.full(len(surface.gml_surface_2array), i))
+        surfacesOfBuildings.append(surfaces)
+
+    if not allPoints:
+        return np.zeros(len(buildings), dtype=bool)
+
+    # only points within the bounding box of the border need the exact test
+    borderArray = np.asarray(borderCoordinates, dtype=np.float64)
+    borderMin = borderArray.min(axis=0)
+    borderMax = borderArray.max(axis=0)
+
+    # any vertex of the building within the border
+    points = np.concatenate(allPoints)
+    pointOwners = np.concatenate(buildingIndex)
+    inBox = np.all((points >= borderMin) & (points <= borderMax), axis=1)
+    pointsInBorder = np.zeros(len(points), dtype=bool)
+    pointsInBorder[inBox] = border.contains_points(points[inBox])
+    inBorder = (
+        np.bincount(pointOwners, weights=pointsInBorder, minlength=len(buildings)) > 0
+    )
+
+    # bounding boxes of the buildings, a building whose box does not touch the
+    # one of the border can not contain any border point
+    buildingMin = np.full((len(buildings), 2), np.inf)
+    buildingMax = np.full((len(buildings), 2), -np.inf)
+    np.minimum.at(buildingMin, pointOwners, points)
+    np.maximum.at(buildingMax, pointOwners, points)
+    touchesBorder = np.all(
+        (buildingMin <= borderMax) & (buildingMax >= borderMin), axis=1
+    )
+
+    # any border point within one of the remaining surfaces
+    for i in np.flatnonzero(~inBorder & touchesBorder):
+        for surface in surfacesOfBuildings[i]:
+            surfacePoints = surface.gml_surface_2array[:, :2]
+            if np.any(surfacePoints.min(axis=0) > borderMax) or np.any(
+                surfacePoints.max(axis=0) < borderMin
+            ):
+                continue
+            n_border = mplP.Path(surfacePoints)
+            if np.any(n_border.contains_points(borderArray)):
+                inBorder[i] = True
+                break
 
-    for buildingPart in building.get_building_parts():
-        res = _check_if_within_border(buildingPart, borderCoordinates, border)
-        if res:
-            return True
-
-    return False
+    return inBorder
 
 
 def check_building_for_address(
@@ -194,47 +266,36 @@ def check_building_for_address(
 
     for buildingPart in building.get_building_parts():
         if not buildingPart.addressCollection.addressCollection_is_empty():
-            if buildingPart.addressColleciion.check_address(addressRestriciton):
+            if buildingPart.addressCollection.check_address(addressRestriciton):
                 return True
 
     return False
 
 
-def _check_if_within_border(
-    building: AbstractBuilding, borderCoordinates: list, border: mplP.Path
-) -> bool | None:
-    """checks if a AbstractBuilding is located within the borderCoordinates
+def _get_border_reference_surfaces(
+    building: AbstractBuilding,
+) -> list[SurfaceGML] | None:
+    """returns the surfaces used to check if a AbstractBuilding is located within
+    border coordinates
 
     Parameters
     ----------
-    borderCoordinates : list
-        2D list of 2D border coordinates
-
-    border : mplP.Path
-        matplotlib.path Path of given coordinates
+    building : AbstractBuilding
+        building or building part to get surfaces from
 
     Returns
     -------
-    bool | None
-        True:  building is located inside the border coordintes
-        False: building is located outside the border coordinates
-        None:  building has no ground reference
+    list[SurfaceGML] | None
+        ground surfaces, roof surfaces if there are no ground surfaces or None if
+        the AbstractBuilding has neither
     """
-
     grounds = building.get_surfaces(["GroundSurface"])
     if len(grounds) != 0:
-        selected_surface = grounds
-    elif building.get_geometries(["RoofSurface"]) != []:
-        selected_surface = building.get_geometries(["RoofSurface"])
-    else:
-        return None
-
-    for surface in selected_surface:
-        two_2array = np.delete(surface.gml_surface_2array, -1, 1)
-        res = _border_check(border, borderCoordinates, two_2array)
-        if res:
-            return True
-    return False
+        return grounds
+    roofs = building.get_surfaces(["RoofSurface"])
+    if roofs:
+        return roofs
+    return None
 
 
 def _border_check(
@@ -256,14 +317,11 @@ def _border_check(
     bool
         returns True if both areas have an overlap
     """
-    for point in list_of_coordinates:
-        if border.contains_point(point):
-            return True
-    n_border = mplP.Path(np.array(list_of_coordinates))
-    for point in list_of_border:
-        if n_border.contains_point(point):
-            return True
-    return False
+    coordinates = np.asarray(list_of_coordinates)
+    if border.contains_points(coordinates).any():
+        return True
+    n_border = mplP.Path(coordinates)
+    return bool(n_border.contains_points(np.asarray(list_of_border)).any())
 
 
 def check_building_for_border_and_address(
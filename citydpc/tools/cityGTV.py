@@ -134,6 +134,8 @@ def _transform_abstractBuilding(
         surface.get_gml_orientation()
         surface.get_gml_tilt()
 
+    building.pack_surface_coordinates()
+
     # delete terrainIntersection
     building.terrainIntersections = None
 
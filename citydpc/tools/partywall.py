@@ -4,23 +4,38 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from citydpc.dataset import Dataset
     from citydpc.core.object.abstractBuilding import AbstractBuilding
+    from citydpc.core.object.building import Building
+    from citydpc.core.object.surfacegml import SurfaceGML
 
 
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import math
+import os
 from shapely import geometry as slyGeom
 import shapely
 
+from citydpc.logger import logger
 from . import PartyWallConfig
 
+# smaller datasets are always searched in the calling process
+_PARALLEL_MIN_BUILDINGS = 100
 
-def get_party_walls(dataset: Dataset) -> list[str, str, str, str, float, list]:
+
+def get_party_walls(
+    dataset: Dataset, numWorkers: int = 1
+) -> list[str, str, str, str, float, list]:
     """checks for adjacent walls in dataset
 
     Parameters
     ----------
     dataset : Dataset
         dataset object containing all buildings that should be checked
+    numWorkers : int, optional
+        number of processes used for the search, None uses os.cpu_count(),
+        by default 1 (search in the calling process), datasets with less than
+        _PARALLEL_MIN_BUILDINGS (100) buildings are always searched in the
+        calling process as starting the workers takes longer than the search
 
     Returns
     -------
@@ -28,122 +43,282 @@ def get_party_walls(dataset: Dataset) -> list[str, str, str, str, float, list]:
         returns a list of all detected party walls as a list of
         [id of b0, id of w0, id of b1, id of w1, area, list of collision coordinates]
     """
+    buildings = dataset.get_building_list()
+
+    if numWorkers is None:
+        numWorkers = os.cpu_count()
+    if numWorkers <= 1 or len(buildings) < _PARALLEL_MIN_BUILDINGS:
+        search = _prepare_party_wall_search(buildings)
+        all_party_walls = []
+        for i in range(len(buildings)):
+            all_party_walls.extend(_get_party_walls_of_building(search, i))
+        return all_party_walls
+
+    # every worker prepares the search for its own copy of the buildings, here
+    # only the wall counters are needed to apply the results of the workers
+    _reset_wall_counters(buildings)
+    # contiguous chunks keep the order of the serial search
+    chunkSize = math.ceil(len(buildings) / (4 * numWorkers))
     all_party_walls = []
-    updNumOfWalls = []
-    for i, building_0 in enumerate(dataset.get_building_list()):
-        if building_0.gml_id not in updNumOfWalls:
-            building_0.allWalls = len(
-                building_0.get_surfaces(surfaceTypes=["WallSurface"])
+    with ProcessPoolExecutor(
+        max_workers=numWorkers,
+        initializer=_init_party_wall_worker,
+        initargs=(buildings,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _get_party_walls_in_worker,
+                range(start, min(start + chunkSize, len(buildings))),
             )
-            building_0.freeWalls = building_0.allWalls
-            updNumOfWalls.append(building_0.gml_id)
-        polys_in_building_0 = []
+            for start in range(0, len(buildings), chunkSize)
+        ]
+        for future in futures:
+            party_walls, usedWalls = future.result()
+            all_party_walls.extend(party_walls)
+            # the workers only changed their own copies of the buildings
+            for (k, m), numUsed in usedWalls.items():
+                buildingLike = (
+                    buildings[k] if m is None else buildings[k].get_building_parts()[m]
+                )
+                buildingLike.freeWalls -= numUsed
+    return all_party_walls
+
+
+def _reset_wall_counters(buildings: list[Building]) -> None:
+    """sets the number of all and free walls of all buildings (and building
+    parts) to their number of wall surfaces
+
+    Parameters
+    ----------
+    buildings : list[Building]
+        buildings that should be checked
+    """
+    for building in buildings:
+        building.allWalls = len(building.get_surfaces(surfaceTypes=["WallSurface"]))
+        building.freeWalls = building.allWalls
+        for b_part in building.get_building_parts():
+            b_part.allWalls = len(b_part.get_surfaces(surfaceTypes=["WallSurface"]))
+            b_part.freeWalls = b_part.allWalls
+
+
+def _prepare_party_wall_search(buildings: list[Building]) -> dict:
+    """resets the wall counters of all buildings (and building parts) and
+    collects their ground surfaces for the party wall search
+
+    Parameters
+    ----------
+    buildings : list[Building]
+        buildings that should be checked
+
+    Returns
+    -------
+    dict
+        buildings, ground surface dicts per building, fingerprints of the
+        ground surfaces per building, colliding ground surfaces of later
+        buildings per building and an empty cache for the wall surfaces of the
+        buildings (parts)
+    """
+    polys_in_buildings = []
+    fingerprints = []
+    # ground surfaces that can be hit by buildings earlier in the list
+    groundPolys = []
+    # owners of the ground polygons as parallel index arrays, the building part
+    # index is -1 for ground surfaces of the building itself
+    groundBuildingIdx = []
+    groundPartIdx = []
+    _reset_wall_counters(buildings)
+    for k, building in enumerate(buildings):
+        polys_in_building = []
         # get coordinates from all groundSurface of building geometry
-        if building_0.has_3Dgeometry():
-            for groundSurface in building_0.get_surfaces(["GroundSurface"]):
-                polys_in_building_0.append(
-                    {
-                        "poly_id": groundSurface.polygon_id,
-                        "coor": groundSurface.gml_surface_2array,
-                        "parent": building_0,
-                    }
+        if building.has_3Dgeometry():
+            for groundSurface in building.get_surfaces(["GroundSurface"]):
+                polys_in_building.append(
+                    _create_ground_poly_dict(groundSurface, building)
                 )
+                groundPolys.append(polys_in_building[-1]["poly"])
+                groundBuildingIdx.append(k)
+                groundPartIdx.append(-1)
 
         # get coordinates from all groundSurface of buildingPart geometries
-        if building_0.has_building_parts():
-            for b_part in building_0.get_building_parts():
-                if b_part.has_3Dgeometry():
-                    if (
-                        f"{building_0.gml_id}/{b_part.gml_id}"
-                        not in updNumOfWalls
-                    ):
-                        b_part.allWalls = len(
-                            b_part.get_surfaces(surfaceTypes=["WallSurface"])
-                        )
-                        b_part.freeWalls = b_part.allWalls
-                        updNumOfWalls.append(
-                            f"{building_0.gml_id}/{b_part.gml_id}"
-                        )
-                    for groundSurface in b_part.get_surfaces(
-                        ["GroundSurface"]
-                    ):
-                        parent = dataset.get_building_by_id(
-                            b_part.parent_gml_id
-                        )
-                        polys_in_building_0.append(
-                            {
-                                "poly_id": groundSurface.polygon_id,
-                                "coor": groundSurface.gml_surface_2array,
-                                "parent": parent,
-                            }
-                        )
+        for m, b_part in enumerate(building.get_building_parts()):
+            if b_part.has_3Dgeometry():
+                for groundSurface in b_part.get_surfaces(["GroundSurface"]):
+                    polys_in_building.append(
+                        _create_ground_poly_dict(groundSurface, building)
+                    )
+                    groundPolys.append(polys_in_building[-1]["poly"])
+                    groundBuildingIdx.append(k)
+                    groundPartIdx.append(m)
+        polys_in_buildings.append(polys_in_building)
+        # identical ground surfaces (e.g. a building copied into two
+        # neighbouring tiles) have identical fingerprints
+        fingerprints.append(
+            np.round(
+                np.concatenate([poly["coor"] for poly in polys_in_building]), 3
+            ).tobytes()
+            if polys_in_building
+            else None
+        )
 
-        # self collision check
-        # this includes all walls of the building (and building parts) geometry
-        for j, poly_0 in enumerate(polys_in_building_0):
-            p_0 = _create_buffered_polygon(
-                poly_0["coor"], PartyWallConfig.GROUNDSURFACE_BUFFER
-            )
-            for poly_1 in polys_in_building_0[j + 1 :]:
-                p_1 = slyGeom.Polygon(poly_1["coor"])
-                if not p_0.intersection(p_1).is_empty:
-                    party_walls = _find_party_walls(poly_0["parent"], poly_1["parent"])
-                    if party_walls != []:
-                        all_party_walls.extend(party_walls)
-
-        # collision with other buildings
-        for building_1 in dataset.get_building_list()[i + 1 :]:
-            if building_1.gml_id not in updNumOfWalls:
-                building_1.allWalls = len(
-                    building_1.get_surfaces(surfaceTypes=["WallSurface"])
+    # collision with other buildings, hits[i][(k, m)] holds the indices of all
+    # ground polygons of building i touching building k (m is None) or its
+    # building part m, all ground polygons are queried in one call and only
+    # those whose bounding boxes overlap are tested exactly
+    hits = [{} for _ in buildings]
+    bufferedPolys = []
+    bufferedBuildingIdx = []
+    bufferedPolyIdx = []
+    for i, polys_in_building in enumerate(polys_in_buildings):
+        for j, poly in enumerate(polys_in_building):
+            bufferedPolys.append(poly["buffered"])
+            bufferedBuildingIdx.append(i)
+            bufferedPolyIdx.append(j)
+    if bufferedPolys:
+        tree = shapely.STRtree(groundPolys)
+        n0, n1 = tree.query(bufferedPolys, predicate="intersects")
+        hitBuildings = np.asarray(bufferedBuildingIdx)[n0]
+        hitPolys = np.asarray(bufferedPolyIdx)[n0]
+        hitOthers = np.asarray(groundBuildingIdx)[n1]
+        hitParts = np.asarray(groundPartIdx)[n1]
+        # only keep hits of buildings later in the list
+        later = hitOthers > hitBuildings
+        for i, j, k, m in zip(
+            hitBuildings[later].tolist(),
+            hitPolys[later].tolist(),
+            hitOthers[later].tolist(),
+            hitParts[later].tolist(),
+        ):
+            hits[i].setdefault((k, None if m < 0 else m), set()).add(j)
+
+    return {
+        "buildings": buildings,
+        "polys": polys_in_buildings,
+        "fingerprints": fingerprints,
+        "hits": hits,
+        "walls": {},
+    }
+
+
+def _get_party_walls_of_building(
+    search: dict, i: int
+) -> list[str, str, str, str, float, list]:
+    """searches the party walls of the i-th building with itself and all
+    following buildings
+
+    Parameters
+    ----------
+    search : dict
+        prepared search as returned by _prepare_party_wall_search
+    i : int
+        index of the building
+
+    Returns
+    -------
+    list
+        list of detected party walls, see get_party_walls
+    """
+    buildings = search["buildings"]
+    polys_in_building_0 = search["polys"][i]
+    all_party_walls = []
+
+    # self collision check
+    # this includes all walls of the building (and building parts) geometry
+    for j, poly_0 in enumerate(polys_in_building_0):
+        for poly_1 in polys_in_building_0[j + 1 :]:
+            if poly_0["buffered"].intersects(poly_1["poly"]):
+                party_walls = _find_party_walls(
+                    poly_0["parent"], poly_1["parent"], search["walls"]
                 )
-                building_1.freeWalls = building_1.allWalls
-                updNumOfWalls.append(building_1.gml_id)
-            # collision with the building itself
-            if building_1.has_3Dgeometry():
-                for poly_0 in polys_in_building_0:
-                    p_0 = _create_buffered_polygon(
-                        poly_0["coor"], PartyWallConfig.GROUNDSURFACE_BUFFER
-                    )
-                    for poly_1 in building_1.get_surfaces(["GroundSurface"]):
-                        p_1 = slyGeom.Polygon(poly_1.gml_surface_2array)
-                        if not p_0.intersection(p_1).is_empty:
-                            party_walls = _find_party_walls(
-                                poly_0["parent"], building_1
-                            )
-                            if party_walls != []:
-                                all_party_walls.extend(party_walls)
-                            break
-
-            # collsion with a building part of the building
-            if building_1.has_building_parts():
-                for b_part in building_1.get_building_parts():
-                    if f"{building_1.gml_id}/{b_part.gml_id}" not in updNumOfWalls:
-                        b_part.allWalls = len(
-                            b_part.get_surfaces(surfaceTypes=["WallSurface"])
-                        )
-                        b_part.freeWalls = b_part.allWalls
-                        updNumOfWalls.append(f"{building_1.gml_id}/{b_part.gml_id}")
-                    if b_part.has_3Dgeometry():
-                        for poly_0 in polys_in_building_0:
-                            p_0 = _create_buffered_polygon(
-                                poly_0["coor"], PartyWallConfig.GROUNDSURFACE_BUFFER
-                            )
-                            for poly_1 in b_part.get_surfaces(["GroundSurface"]):
-                                p_1 = slyGeom.Polygon(poly_1.gml_surface_2array)
-                                if not p_0.intersection(p_1).is_empty:
-                                    # To-Do: building (or bp) with other building part
-                                    party_walls = _find_party_walls(
-                                        poly_0["parent"], b_part
-                                    )
-                                    if party_walls != []:
-                                        all_party_walls.extend(party_walls)
-                                    break
+                if party_walls:
+                    all_party_walls.extend(party_walls)
+
+    # collision with other buildings
+    # keep the order of a pairwise comparison of all buildings
+    hits = search["hits"][i]
+    fingerprints = search["fingerprints"]
+    duplicates = set()
+    for k, m in sorted(
+        hits, key=lambda key: (key[0], -1 if key[1] is None else key[1])
+    ):
+        # skip duplicates of the building, all of their walls would be found
+        if fingerprints[k] == fingerprints[i]:
+            if k not in duplicates:
+                duplicates.add(k)
+                logger.warning(
+                    f"Buildings {buildings[i].gml_id} and {buildings[k].gml_id} "
+                    "have identical ground surfaces, skipping the party wall "
+                    "search between them"
+                )
+            continue
+        buildingLike_1 = (
+            buildings[k] if m is None else buildings[k].get_building_parts()[m]
+        )
+        for j in sorted(hits[(k, m)]):
+            party_walls = _find_party_walls(
+                polys_in_building_0[j]["parent"], buildingLike_1, search["walls"]
+            )
+            if party_walls:
+                all_party_walls.extend(party_walls)
     return all_party_walls
 
 
+# prepared party wall search of a worker process
+_workerSearch = None
+
+
+def _init_party_wall_worker(buildings: list[Building]) -> None:
+    """prepares the party wall search in a worker process
+
+    Parameters
+    ----------
+    buildings : list[Building]
+        buildings that should be checked
+    """
+    global _workerSearch
+    _workerSearch = _prepare_party_wall_search(buildings)
+
+
+def _get_party_walls_in_worker(
+    indices: range,
+) -> tuple[list[str, str, str, str, float, list], dict]:
+    """searches the party walls of the buildings at indices in a worker process
+
+    Parameters
+    ----------
+    indices : range
+        indices of the buildings
+
+    Returns
+    -------
+    tuple[list, dict]
+        list of detected party walls and number of walls used as party wall
+        by (building index, building part index or None)
+    """
+    buildings = _workerSearch["buildings"]
+    freeWalls = {}
+    for k, building in enumerate(buildings):
+        freeWalls[(k, None)] = building.freeWalls
+        for m, b_part in enumerate(building.get_building_parts()):
+            freeWalls[(k, m)] = b_part.freeWalls
+
+    all_party_walls = []
+    for i in indices:
+        all_party_walls.extend(_get_party_walls_of_building(_workerSearch, i))
+
+    usedWalls = {}
+    for (k, m), numFree in freeWalls.items():
+        buildingLike = (
+            buildings[k] if m is None else buildings[k].get_building_parts()[m]
+        )
+        if buildingLike.freeWalls != numFree:
+            usedWalls[(k, m)] = numFree - buildingLike.freeWalls
+    return all_party_walls, usedWalls
+
+
 def _find_party_walls(
-    buildingLike_0: AbstractBuilding, buildingLike_1: AbstractBuilding
+    buildingLike_0: AbstractBuilding,
+    buildingLike_1: AbstractBuilding,
+    wallSurfaces: dict = None,
 ) -> list[str, str, str, str, float, list]:
     """takes to buildings and searches for party walls
 
@@ -153,6 +328,9 @@ def _find_party_walls(
         first building to check
     buildingLike_1 : AbstractBuilding
         second building to check
+    wallSurfaces : dict, optional
+        cache for the results of _get_wall_surfaces by id() of the building
+        (part), by default None
 
     Returns
     -------
@@ -160,170 +338,259 @@ def _find_party_walls(
         returns a list of all detected party walls as a list of
         [id of b0, id of w0, id of b1, id of w1, area, list of collision coordinates]
     """
-    np.set_printoptions(suppress=True)
     party_walls = []
-    b_0_surfaces = buildingLike_0.get_surfaces(["WallSurface", "ClosureSurface"])
-    b_1_surfaces = buildingLike_1.get_surfaces(["WallSurface", "ClosureSurface"])
-    # b_0_normvectors = _coor_dict_to_normvector_dict(b_0_surfaces)
-    # b_1_normvectors = _coor_dict_to_normvector_dict(b_1_surfaces)
-    for surface_0 in b_0_surfaces:
+    if wallSurfaces is None:
+        wallSurfaces = {}
+    for buildingLike in (buildingLike_0, buildingLike_1):
+        if id(buildingLike) not in wallSurfaces:
+            wallSurfaces[id(buildingLike)] = _get_wall_surfaces(buildingLike)
+    walls_0 = wallSurfaces[id(buildingLike_0)]
+    walls_1 = wallSurfaces[id(buildingLike_1)]
+    b_0_surfaces = walls_0["surfaces"]
+    b_1_surfaces = walls_1["surfaces"]
+    if not b_0_surfaces or not b_1_surfaces:
+        return party_walls
+
+    normals_0 = walls_0["normals"]
+    normals_1 = walls_1["normals"]
+
+    # consider walls if there norm vectors equal or inverse or don't
+    # difffer more than PartyWallConfig.MAX_NORM_VECTOR_ANGLE_DIFF
+    equalNormals = np.all(normals_0[:, None, :] == normals_1[None, :, :], axis=2)
+    inverseNormals = np.all(normals_0[:, None, :] == -normals_1[None, :, :], axis=2)
+    candidates = (
+        equalNormals
+        | inverseNormals
+        | (np.abs(normals_0 @ normals_1.T) > PartyWallConfig.MAX_NORM_VECTOR_ANGLE_DIFF)
+    )
+
+    for idx0, surface_0 in enumerate(b_0_surfaces):
         hitS0 = False
-        for surface_1 in b_1_surfaces:
-            hitS1 = False
-            # consider walls if there norm vectors equal or inverse or don't
-            # difffer more than PartyWallConfig.MAX_NORM_VECTOR_ANGLE_DIFF
-            if (
-                np.array_equal(surface_0.normal_uni, surface_1.normal_uni)
-                or np.array_equal(surface_0.normal_uni, -surface_1.normal_uni)
-                or np.abs(np.dot(surface_0.normal_uni, surface_1.normal_uni))
-                > PartyWallConfig.MAX_NORM_VECTOR_ANGLE_DIFF
+        candidates_1 = np.flatnonzero(candidates[idx0])
+        if len(candidates_1) == 0:
+            continue
+
+        # the rotation only depends on surface_0 and is shared by all candidates
+        # (and all later calls with the same building)
+        if idx0 not in walls_0["rotations"]:
+            walls_0["rotations"][idx0] = _get_wall_rotation(
+                surface_0, walls_0["noRotation"][idx0]
+            )
+        rad_angle, rot_point, target_y, poly_0_rotated = walls_0["rotations"][idx0]
+        mean_y_0 = poly_0_rotated[:, 1].sum() / len(poly_0_rotated)
+        # bounding box of surface_0 without the rotated y axis
+        min_0 = poly_0_rotated[:, ::2].min(axis=0)
+        max_0 = poly_0_rotated[:, ::2].max(axis=0)
+
+        # rotate the candidates and keep those that can share an area with
+        # surface_0
+        survivors = []
+        polys_1 = []
+        candidatePolys = [
+            b_1_surfaces[idx1].gml_surface_2array for idx1 in candidates_1
+        ]
+        if rad_angle is not None:
+            # rotate all candidates in one call and split them again
+            rotated = _rotate_polygon_around_point_in_x_y(
+                np.concatenate(candidatePolys), rot_point, rad_angle
+            )
+            candidatePolys = np.split(
+                rotated, np.cumsum([len(poly) for poly in candidatePolys[:-1]])
+            )
+        for idx1, poly_1_rotated in zip(candidates_1, candidatePolys):
+            # check distance in rotated y direction (if distance is larger
+            # than GROUNDSURFACE_BUFFER walls shouldn't be considered as
+            # party walls)
+            mean_y_1 = poly_1_rotated[:, 1].sum() / len(poly_1_rotated)
+            if abs(mean_y_0 - mean_y_1) > PartyWallConfig.GROUNDSURFACE_BUFFER:
+                continue
+
+            # walls whose bounding boxes don't overlap can't share an area
+            if np.any(poly_1_rotated[:, ::2].min(axis=0) >= max_0) or np.any(
+                poly_1_rotated[:, ::2].max(axis=0) <= min_0
             ):
-                # check if rotation is needed
-                if np.array_equal(
-                    surface_0.normal_uni, np.array([0, 1, 0])
-                ) or np.array_equal(surface_0.normal_uni, -np.array([0, 1, 0])):
-                    # rotation not needed
-                    poly_0_rotated = surface_0.gml_surface_2array
-                    poly_1_rotated = surface_1.gml_surface_2array
-                    rad_angle = None
-                    target_y = surface_0.gml_surface_2array[0][1]
-                    rot_point = None
-                else:
-                    # needs to be rotated
-                    t_surf_0 = surface_0.gml_surface_2array
-                    t_surf_1 = surface_1.gml_surface_2array
-                    # get delta in x- and y-direction for roation
-                    # make sure that the vector between the 1st and 2nd point
-                    # isn't [0 0 *]
-                    if not (
-                        t_surf_0[0][0] == t_surf_0[1][0]
-                        and t_surf_0[0][1] == t_surf_0[1][1]
-                    ):
-                        delta_x = t_surf_0[0][0] - t_surf_0[1][0]
-                        delta_y = t_surf_0[0][1] - t_surf_0[1][1]
-                    else:
-                        # in case the vector between the 1st and 2nd coordiante is only
-                        # vertical
-                        delta_x = t_surf_0[0][0] - t_surf_0[2][0]
-                        delta_y = t_surf_0[0][1] - t_surf_0[2][1]
-
-                    rad_angle = (
-                        -math.atan2(delta_y, delta_x) if delta_x != 0 else math.pi / 2
-                    )
-                    target_y = t_surf_0[0][1]
-                    rot_point = t_surf_0[0]
-                    poly_0_rotated = _rotate_polygon_around_point_in_x_y(
-                        t_surf_0, rot_point, rad_angle
-                    )
-                    poly_1_rotated = _rotate_polygon_around_point_in_x_y(
-                        t_surf_1, rot_point, rad_angle
-                    )
-
-                # check distance in rotated y direction (if distance is larger
-                # than GROUNDSURFACE_BUFFER walls shouldn't be considered as
-                # party walls)
-                if (
-                    abs(
-                        np.mean(poly_0_rotated, axis=0)[1]
-                        - np.mean(poly_1_rotated, axis=0)[1]
-                    )
-                    > PartyWallConfig.GROUNDSURFACE_BUFFER
-                ):
-                    continue
-
-                # delete 3rd axis
-                poly_0_rotated_2D = np.delete(poly_0_rotated, 1, axis=1)
-                poly_1_rotated_2D = np.delete(poly_1_rotated, 1, axis=1)
-                # create shapely polygons
-                p_0 = slyGeom.Polygon(poly_0_rotated_2D)
-                p_1 = slyGeom.Polygon(poly_1_rotated_2D)
-                # calculate intersection
-                intersection = p_0.intersection(p_1)
-                if not intersection.is_empty:
-                    if intersection.area > 5:
-                        id_0 = (
-                            buildingLike_0.gml_id
-                            if not buildingLike_0.is_building_part
-                            else buildingLike_0.parent_gml_id
-                            + "/"
-                            + buildingLike_0.gml_id
+                continue
+
+            # create shapely polygon without the rotated y axis
+            survivors.append(idx1)
+            polys_1.append(slyGeom.Polygon(poly_1_rotated[:, ::2]))
+        if not survivors:
+            continue
+
+        # intersect surface_0 with all remaining candidates in one call
+        p_0 = slyGeom.Polygon(poly_0_rotated[:, ::2])
+        intersections = shapely.intersection(p_0, polys_1)
+        areas = shapely.area(intersections)
+        for idx1, intersection, area in zip(survivors, intersections, areas):
+            if area <= 5:
+                continue
+            surface_1 = b_1_surfaces[idx1]
+            hitS1 = False
+            id_0 = (
+                buildingLike_0.gml_id
+                if not buildingLike_0.is_building_part
+                else buildingLike_0.parent_gml_id + "/" + buildingLike_0.gml_id
+            )
+            id_1 = (
+                buildingLike_1.gml_id
+                if not buildingLike_1.is_building_part
+                else buildingLike_1.parent_gml_id + "/" + buildingLike_1.gml_id
+            )
+            if type(intersection) is shapely.Polygon:
+                threeD_contact = _get_collision_unrotated(
+                    intersection, rot_point, rad_angle, target_y
+                )
+                party_walls.append(
+                    [
+                        id_0,
+                        surface_0.polygon_id,
+                        id_1,
+                        surface_1.polygon_id,
+                        intersection.area,
+                        threeD_contact,
+                    ]
+                )
+                if not hitS0:
+                    buildingLike_0.freeWalls -= 1
+                if not hitS1:
+                    buildingLike_1.freeWalls -= 1
+                hitS0 = True
+                hitS1 = True
+
+            elif type(intersection) is shapely.GeometryCollection:
+                for section in intersection.geoms:
+                    if type(section) is shapely.Polygon and section.area > 5:
+                        threeD_contact = _get_collision_unrotated(
+                            section, rot_point, rad_angle, target_y
                         )
-                        id_1 = (
-                            buildingLike_1.gml_id
-                            if not buildingLike_1.is_building_part
-                            else buildingLike_1.parent_gml_id
-                            + "/"
-                            + buildingLike_1.gml_id
+                        party_walls.append(
+                            [
+                                id_0,
+                                surface_0.polygon_id,
+                                id_1,
+                                surface_1.polygon_id,
+                                section.area,
+                                threeD_contact,
+                            ]
                         )
-                        if type(intersection) is shapely.Polygon:
-                            threeD_contact = _get_collision_unrotated(
-                                intersection, rot_point, rad_angle, target_y
-                            )
-                            party_walls.append(
-                                [
-                                    id_0,
-                                    surface_0.polygon_id,
-                                    id_1,
-                                    surface_1.polygon_id,
-                                    intersection.area,
-                                    threeD_contact,
-                                ]
-                            )
-                            if not hitS0:
-                                buildingLike_0.freeWalls -= 1
-                            if not hitS1:
-                                buildingLike_1.freeWalls -= 1
-                            hitS0 = True
-                            hitS1 = True
-
-                        elif type(intersection) is shapely.GeometryCollection:
-                            for section in intersection.geoms:
-                                if (
-                                    type(section) is shapely.Polygon
-                                    and section.area > 5
-                                ):
-                                    threeD_contact = _get_collision_unrotated(
-                                        section, rot_point, rad_angle, target_y
-                                    )
-                                    party_walls.append(
-                                        [
-                                            id_0,
-                                            surface_0.polygon_id,
-                                            id_1,
-                                            surface_1.polygon_id,
-                                            section.area,
-                                            threeD_contact,
-                                        ]
-                                    )
-                                    if not hitS0:
-                                        buildingLike_0.freeWalls -= 1
-                                    if not hitS1:
-                                        buildingLike_1.freeWalls -= 1
-                                    hitS0 = True
-                                    hitS1 = True
+                        if not hitS0:
+                            buildingLike_0.freeWalls -= 1
+                        if not hitS1:
+                            buildingLike_1.freeWalls -= 1
+                        hitS0 = True
+                        hitS1 = True
 
     return party_walls
 
 
-def _create_buffered_polygon(
-    coordinates: np.ndarray, buffer: float = 0.15
-) -> slyGeom.Polygon:
-    """creates a buffered shapely polygon
+def _get_wall_surfaces(buildingLike: AbstractBuilding) -> dict:
+    """returns the surfaces that can be party walls and their normal vectors
+
+    Parameters
+    ----------
+    buildingLike : AbstractBuilding
+        building or building part
+
+    Returns
+    -------
+    dict
+        wall and closure surfaces, 2D array of their unit normal vectors, if
+        they need to be rotated and an empty cache for their rotations
+    """
+    surfaces = buildingLike.get_surfaces(["WallSurface", "ClosureSurface"])
+    normals = np.array([surface.normal_uni for surface in surfaces]).reshape(-1, 3)
+    # walls facing in (negative) y direction don't need to be rotated
+    noRotation = np.all(normals == [0, 1, 0], axis=1) | np.all(
+        normals == [0, -1, 0], axis=1
+    )
+    return {
+        "surfaces": surfaces,
+        "normals": normals,
+        "noRotation": noRotation,
+        "rotations": {},
+    }
+
+
+def _get_wall_rotation(
+    surface: SurfaceGML, noRotation: bool
+) -> tuple[float | None, list | None, float, np.ndarray]:
+    """calculates the rotation around the z axis that aligns the wall with the
+    x axis
+
+    Parameters
+    ----------
+    surface : SurfaceGML
+        wall or closure surface
+    noRotation : bool
+        True if the wall is already facing in (negative) y direction
+
+    Returns
+    -------
+    tuple[float | None, list | None, float, np.ndarray]
+        rotation angle, rotation center (both None if no rotation is needed),
+        y coordinate of the rotated wall and rotated coordinates of the wall
+    """
+    t_surf_0 = surface.gml_surface_2array
+    # the first points as plain floats, scalar math on numpy elements is slow
+    p_0, p_1, p_2 = t_surf_0[:3].tolist()
+    target_y = p_0[1]
+    # check if rotation is needed
+    if noRotation:
+        # rotation not needed
+        return None, None, target_y, t_surf_0
+
+    # needs to be rotated
+    # get delta in x- and y-direction for roation
+    # make sure that the vector between the 1st and 2nd point
+    # isn't [0 0 *]
+    if not (p_0[0] == p_1[0] and p_0[1] == p_1[1]):
+        delta_x = p_0[0] - p_1[0]
+        delta_y = p_0[1] - p_1[1]
+    else:
+        # in case the vector between the 1st and 2nd coordiante is only
+        # vertical
+        delta_x = p_0[0] - p_2[0]
+        delta_y = p_0[1] - p_2[1]
+
+    rad_angle = -math.atan2(delta_y, delta_x) if delta_x != 0 else math.pi / 2
+    return (
+        rad_angle,
+        p_0,
+        target_y,
+        _rotate_polygon_around_point_in_x_y(t_surf_0, p_0, rad_angle),
+    )
+
+
+def _create_ground_poly_dict(
+    groundSurface: SurfaceGML, parent: AbstractBuilding
+) -> dict:
+    """creates the shapely polygons of a ground surface used for the collision
+    checks
 
     Parameters
     ----------
-    coordinates : np.ndarray
-        list of coordiantes that should be buffered
-    buffer : float, optional
-        buffer distance, by default 0.15
+    groundSurface : SurfaceGML
+        ground surface of the building or building part
+    parent : AbstractBuilding
+        building to search party walls for if the ground surface collides
 
     Returns
     -------
-    slyGeom.Polygon
-        returns a buffered shapely Polygon
+    dict
+        poly_id, coordinates, parent, shapely Polygon and buffered (prepared)
+        shapely Polygon of the ground surface
     """
-    poly = slyGeom.Polygon(coordinates)
-    return poly.buffer(buffer)
+    poly = slyGeom.Polygon(groundSurface.gml_surface_2array)
+    buffered = poly.buffer(PartyWallConfig.GROUNDSURFACE_BUFFER)
+    # the buffered polygon is tested against many ground surfaces
+    shapely.prepare(buffered)
+    return {
+        "poly_id": groundSurface.polygon_id,
+        "coor": groundSurface.gml_surface_2array,
+        "parent": parent,
+        "poly": poly,
+        "buffered": buffered,
+    }
 
 
 def _get_collision_unrotated(
@@ -351,27 +618,25 @@ def _get_collision_unrotated(
         list of coordinates after rotation
     """
     xx, yy = intersection_poly.exterior.xy
-    n = []
-    for x, y in zip(xx.tolist(), yy.tolist()):
-        n.append([x, target_y, y])
+    n = np.column_stack((xx, np.full(len(xx), target_y, dtype=np.float64), yy))
     if rot_angle is not None:
         return _rotate_polygon_around_point_in_x_y(
             n, rotation_center, -rot_angle
-        )
+        ).tolist()
     else:
-        return n
+        return n.tolist()
 
 
 def _rotate_polygon_around_point_in_x_y(
-    polygon: list, rotation_center: list, rot_angle: float
-) -> list:
+    polygon: np.ndarray | list, rotation_center: list, rot_angle: float
+) -> np.ndarray:
     """rotates a polygon around a rotation center by an angle (in radians) in
     counter-clockwise direction
 
     Parameters
     ----------
-    polygon : list
-        list of coordinates
+    polygon : np.ndarray | list
+        2D array or list of coordinates
     rotation_center : list
         coordinate around which the polygon should be rotaded
     rot_angle : float
@@ -379,14 +644,15 @@ def _rotate_polygon_around_point_in_x_y(
 
     Returns
     -------
-    list
-        list of coordinates after rotation
+    np.ndarray
+        2D array of coordinates after rotation
     """
     ox, oy, _ = rotation_center
-    rotated = []
-    for point in polygon:
-        px, py, pz = point
-        qx = ox + math.cos(rot_angle) * (px - ox) - math.sin(rot_angle) * (py - oy)
-        qy = oy + math.sin(rot_angle) * (px - ox) + math.cos(rot_angle) * (py - oy)
-        rotated.append([qx, qy, pz])
+    cos = math.cos(rot_angle)
+    sin = math.sin(rot_angle)
+    rotated = np.array(polygon, dtype=np.float64)
+    dx = rotated[:, 0] - ox
+    dy = rotated[:, 1] - oy
+    rotated[:, 0] = ox + cos * dx - sin * dy
+    rotated[:, 1] = oy + sin * dx + cos * dy
     return rotated
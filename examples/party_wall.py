@@ -6,9 +6,8 @@ from PySide6 import QtWidgets
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
 import numpy as np
-import xml.etree.ElementTree as ET
 
 from citydpc.dataset import Dataset
 from citydpc.core.input.citygmlInput import load_buildings_from_xml_file
@@ -25,21 +24,29 @@ You will need to install PySide6 to run this script.
 
 """
 fileName = "examples/files/EssenExample.gml"
-
-
-def getPosListOfSurface(surface_E, namespace):
-    """extracts a numpy array of coordinates from a surface"""
-    for polygon_E in surface_E.findall('.//gml:Polygon',namespace):
-        Pts = polygon_E.find('.//gml:posList',namespace)
-        if Pts is not None:
-            posList = np.array(str(Pts.text).split(' '))
-        else:
-            points = []
-            for Pt in polygon_E.findall('.//gml:pos', namespace):
-                points.extend([float(i) for i in Pt.text.split(' ')])
-            posList = np.array(points)
-    return posList.astype(np.float64)
-
+# number of processes used to load the file and search the party walls,
+# None uses all cores (only worth it for large files)
+numWorkers = 1
+
+
+def getSurfacesOfDataset(dataset):
+    """collects the coordinates of the roof, ground and wall surfaces of all
+    buildings (and building parts) in dataset as lists of (N, 3) arrays"""
+    roof_list = []
+    foot_list = []
+    wall_list = []
+    surface_lists = {'RoofSurface': roof_list, 'GroundSurface': foot_list, 'WallSurface': wall_list}
+    for building in dataset.get_building_list():
+        for buildingLike in [building] + building.get_building_parts():
+            for surface in buildingLike.get_surfaces(list(surface_lists)):
+                # keep float64, float32 only resolves ~0.5 m at UTM northings (~5.7e6 m)
+                surface_lists[surface.surface_type].append(surface.gml_surface_2array)
+
+    print("Extracted " + str(len(dataset)) + " Buildings.")
+    print("Extracted " + str(len(roof_list)) + " roof surfaces.")
+    print("Extracted " + str(len(foot_list)) + " foot prints.")
+    print("Extracted " + str(len(wall_list))+ " wall surfaces.")
+    return roof_list, foot_list, wall_list
 
 
 class MplCanvas(FigureCanvasQTAgg):
@@ -58,105 +65,16 @@ class MainWindow(QtWidgets.QMainWindow):
         # Create the maptlotlib FigureCanvas object,
         # which defines a single set of axes as self.axes.
         sc = MplCanvas(self, width=5, height=4, dpi=100)
-        tree = ET.parse(fileName)
-        root = tree.getroot()
-
-        # nameSpace used for ElementTree's search function
-        # CityGML 1.0
-        _nameSpace1 = {'core':"http://www.opengis.net/citygml/1.0",
-        'gen':"http://www.opengis.net/citygml/generics/1.0",
-        'grp':"http://www.opengis.net/citygml/cityobjectgroup/1.0",
-        'app':"http://www.opengis.net/citygml/appearance/1.0",
-        'bldg':"http://www.opengis.net/citygml/building/1.0",
-        'gml':"http://www.opengis.net/gml",
-        'xal':"urn:oasis:names:tc:ciq:xsdschema:xAL:2.0",
-        'xlink':"http://www.w3.org/1999/xlink",
-        'xsi':"http://www.w3.org/2001/XMLSchema-instance"}
-
-        # CityGML 2.0
-        _nameSpace2 = {'core':"http://www.opengis.net/citygml/2.0",
-        'gen':"http://www.opengis.net/citygml/generics/2.0",
-        'grp':"http://www.opengis.net/citygml/cityobjectgroup/2.0",
-        'app':"http://www.opengis.net/citygml/appearance/2.0",
-        'bldg':"http://www.opengis.net/citygml/building/2.0",
-        'gml':"http://www.opengis.net/gml",
-        'xal':"urn:oasis:names:tc:ciq:xsdschema:xAL:2.0",
-        'xlink':"http://www.w3.org/1999/xlink",
-        'xsi':"http://www.w3.org/2001/XMLSchema-instance"}
-
-        # check the version of CityGML
-        with open(fileName,"r") as fileHandle:
-            version = 0
-            for line in fileHandle.readlines():
-                #print("current line = ",line)
-                if str(line).find("citygml/1.0")!= -1:
-                    _nameSpace = _nameSpace1
-                    version = 1
-                    print("CityGml Version = 1.0")
-                    break
-                elif str(line).find("citygml/2.0")!= -1:
-                    _nameSpace = _nameSpace2
-                    version = 2
-                    print("CityGML Version = 2.0")
-                    break
-            # end loop 
-            if version == 0:
-                print("CityGML Version Not Supported.")
-                return -1
-
-        roof_list = []
-        foot_list = []
-        wall_list = []
-
-        num_building = 0
-        for bldg in root.findall('.//bldg:Building',_nameSpace):
-            num_building += 1
-            for roof in bldg.findall('.//bldg:RoofSurface',_nameSpace):
-                posList = getPosListOfSurface(roof, _nameSpace)
-                roof = []
-                for j in range(int(len(posList)/3)):
-                    pt = [posList[3*j],posList[3*j+1],posList[3*j+2]]
-                    roof.append(pt)
-                roof_list.append(roof)
-            for foot in bldg.findall('.//bldg:GroundSurface',_nameSpace):
-                posList = getPosListOfSurface(foot, _nameSpace)
-                foot = []
-                for j in range(int(len(posList)/3)):
-                    pt = [posList[3*j],posList[3*j+1],posList[3*j+2]]
-                    foot.append(pt)
-                foot_list.append(foot)
-            for wall in bldg.findall('.//bldg:WallSurface',_nameSpace):
-                posList = getPosListOfSurface(wall, _nameSpace)
-                wall = []
-                for j in range(int(len(posList)/3)):
-                    pt = [posList[3*j],posList[3*j+1],posList[3*j+2]]
-                    wall.append(pt)
-                wall_list.append(wall)
-
-        print("Extracted " + str(num_building) + " Buildings.")
-        print("Extracted " + str(len(roof_list)) + " roof surfaces.")
-        print("Extracted " + str(len(foot_list)) + " foot prints.")
-        print("Extracted " + str(len(wall_list))+ " wall surfaces.")
 
+        # the dataset is the single source of the buildings, it is used for
+        # the plot and the party wall search
+        current_data = Dataset()
+        load_buildings_from_xml_file(current_data, fileName, numWorkers=numWorkers)
+        roof_list, foot_list, wall_list = getSurfacesOfDataset(current_data)
 
-        minRange = np.array([0,0,0])
-        maxRange = np.array([0,0,0])
-
-        totalPts = []
-        for roof in roof_list:
-            for pt in roof:
-                totalPts.append(pt)
-        for foot in foot_list:
-            for pt in roof:
-                totalPts.append(pt)
-        for wall in wall_list:
-            for pt in roof:
-                totalPts.append(pt)
-        
-        totalPts = np.array(totalPts)
-
-        minRange = [np.amin(totalPts[:,0]),np.amin(totalPts[:,1]),np.amin(totalPts[:,2])]
-        maxRange = [np.amax(totalPts[:,0]),np.amax(totalPts[:,1]),np.amax(totalPts[:,2])]
+        totalPts = np.vstack(roof_list + foot_list + wall_list)
+        minRange = np.amin(totalPts, axis=0)
+        maxRange = np.amax(totalPts, axis=0)
 
         #---------------------------------------------------------------------------------------
         # Drawings
@@ -165,120 +83,45 @@ class MainWindow(QtWidgets.QMainWindow):
         # ax1.azim = 100
         lineWidth = 0.5
 
-        axLabelSign = 0
-        for roof in roof_list:
-            xs = []
-            ys = []
-            zs = []
-            for pt in roof:
-                xs.append(pt[0])
-                ys.append(pt[1])
-                zs.append(pt[2])
-            xs = np.asarray(xs)
-            ys = np.asarray(ys)
-            zs = np.asarray(zs)
-            if axLabelSign == 0:
-                sc.axes.plot(xs,ys,zs,color='firebrick',lw=lineWidth,label='Roofedges')
-                axLabelSign = 1
-            else:
-                sc.axes.plot(xs,ys,zs,color='firebrick',lw=lineWidth)
-            # polygon
-            verts = [list(zip(xs,ys,zs))]
-            sc.axes.add_collection(Poly3DCollection(verts,alpha=0.1,facecolor='red'))
-            
-        axLabelSign = 0
-        for foot in foot_list:
-            xs = []
-            ys = []
-            zs = []
-            for pt in foot:
-                #ax1.scatter(pt[0],pt[1],pt[2],marker='^',color='indigo')
-                xs.append(pt[0])
-                ys.append(pt[1])
-                zs.append(pt[2]) 
-            xs = np.asarray(xs)
-            ys = np.asarray(ys)
-            zs = np.asarray(zs)
-            if axLabelSign == 0:
-                sc.axes.plot(xs,ys,zs,color='navy',lw=lineWidth,label='Footprints')
-                axLabelSign = 1
-            else:
-                sc.axes.plot(xs,ys,zs,color='navy',lw=lineWidth)
-            # polygon
-            verts = [list(zip(xs,ys,zs))]
-            sc.axes.add_collection(Poly3DCollection(verts,alpha=0.1,facecolor='royalblue'))
-
-
         # party
-        current_data = Dataset()
-        load_buildings_from_xml_file(current_data, fileName)
-        party_walls = get_party_walls(current_data)
+        party_walls = get_party_walls(current_data, numWorkers=numWorkers)
         print(f"party wall count= {len(party_walls)}")
 
-        axLabelSign = 0
-        for _, _, _, _, _, wall in party_walls:
-            xs = []
-            ys = []
-            zs = []
-            for pt in wall:
-                xs.append(pt[0])
-                ys.append(pt[1])
-                zs.append(pt[2]) 
-            xs = np.asarray(xs)
-            ys = np.asarray(ys)
-            zs = np.asarray(zs)
-            if axLabelSign == 0:
-                sc.axes.plot(xs,ys,zs,color='black',lw=lineWidth,label='PartyWalls')
-                axLabelSign = 1
-            else:
-                sc.axes.plot(xs,ys,zs,color='black',lw=lineWidth)
-            #polygon
-            verts = [list(zip(xs,ys,zs))]
-            sc.axes.add_collection(Poly3DCollection(verts,alpha=0.6,facecolor='darkgreen'))
+        party_list = [np.asarray(wall) for _, _, _, _, _, wall in party_walls]
 
-        axLabelSign = 0
-        for wall in wall_list:
-            
-            xs = []
-            ys = []
-            zs = []
-            for pt in wall:
-                xs.append(pt[0])
-                ys.append(pt[1])
-                zs.append(pt[2]) 
-            xs = np.asarray(xs)
-            ys = np.asarray(ys)
-            zs = np.asarray(zs)
-            if axLabelSign == 0:
-                sc.axes.plot(xs,ys,zs,color='darkorange',lw=lineWidth,label='Walls')
-                axLabelSign = 1
-            else:
-                sc.axes.plot(xs,ys,zs,color='darkorange',lw=lineWidth)
-            #polygon
-            verts = [list(zip(xs,ys,zs))]
-            sc.axes.add_collection(Poly3DCollection(verts,alpha=0.1,facecolor='gold'))
+        # one collection for the edges and one for the polygons of each type
+        for surfaces, edgeColor, faceColor, alpha, label in (
+            (roof_list, 'firebrick', 'red', 0.1, 'Roofedges'),
+            (foot_list, 'navy', 'royalblue', 0.1, 'Footprints'),
+            (party_list, 'black', 'darkgreen', 0.6, 'PartyWalls'),
+            (wall_list, 'darkorange', 'gold', 0.1, 'Walls'),
+        ):
+            sc.axes.add_collection(Line3DCollection(surfaces,colors=edgeColor,linewidths=lineWidth,label=label))
+            sc.axes.add_collection(Poly3DCollection(surfaces,alpha=alpha,facecolor=faceColor))
+        # the legend entries come from the labels of the edge collections
+        sc.axes.legend()
+
+        # collections don't update the data limits of the axes
+        sc.axes.auto_scale_xyz(totalPts[:,0], totalPts[:,1], totalPts[:,2])
 
-                    
         # Set Equal Boundaries for xyz axis, using exact range of coordinates
         # To fool the matplotlib's automatic setting of the scales of xyz-axis
         rangeDiff = np.subtract(maxRange,minRange)
         maxDiff = np.max(rangeDiff)
         print(rangeDiff)
 
+        # plot the 8 (invisible) corners of a cube around all coordinates
+        center = 0.5*(maxRange+minRange)
+        corners = center + 0.5*maxDiff*np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)])
+        sc.axes.plot(corners[:,0], corners[:,1], corners[:,2], 'w', linestyle='none')
 
-        Xb_1 = 0.5*maxDiff*np.mgrid[-1:1:0.5,-0.5:1.5:0.5,-0.5:1.5:0.5][0].flatten() + 0.5*(maxRange[0]+minRange[0])
-        Yb_1 = 0.5*maxDiff*np.mgrid[-1:1:0.5,-0.5:1.5:0.5,-0.5:1.5:0.5][1].flatten() + 0.5*(maxRange[1]+minRange[1])
-        Zb_1 = 0.5*maxDiff*np.mgrid[-1:1:0.5,-0.5:1.5:0.5,-0.5:1.5:0.5][2].flatten() + 0.5*(maxRange[2]+minRange[2])
-
-        for xb1, yb1, zb1 in zip(Xb_1, Yb_1, Zb_1):
-            #print(xb1,yb1,zb1)
-            sc.axes.plot([xb1], [yb1], [zb1], 'w')
-        
         self.setCentralWidget(sc)
 
         self.show()
 
 
-app = QtWidgets.QApplication(sys.argv)
-w = MainWindow()
-app.exec()
\ No newline at end of file
+# worker processes import this script again, so only start the app here
+if __name__ == "__main__":
+    app = QtWidgets.QApplication(sys.argv)
+    w = MainWindow()
+    app.exec()
\ No newline at end of file